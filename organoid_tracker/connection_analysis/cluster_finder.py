@@ -1,5 +1,5 @@
 """Used to find groups of positions that are connected to each other using connections."""
-from typing import Optional, Set, List
+from typing import Set, List, Dict
 
 from organoid_tracker.core import TimePoint
 from organoid_tracker.core.connections import Connections
@@ -18,57 +18,58 @@ class Cluster:
         return "Cluster(" + ", ".join(repr(position) for position in self.positions) + ")"
 
 
-def _try_remove(set: Set[Position], position: Position):
-    """Tries to remove a position from a set, but does nothing if the position is not in the set."""
-    if position in set:
-        set.remove(position)
+def _find_root(parents: List[int], index: int) -> int:
+    """Finds the root of the given index in a union-find forest. Shortens the path to the root along the way, so that
+    the next search is faster."""
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
 
 
 def find_clusters(positions: PositionCollection, connections: Connections, time_point: TimePoint) -> List[Cluster]:
     """Returns all clusters - positions that are connected via one or more connections. If position X and position Y are
     in the same cluster, it means that if you follow one or multiple connections, you can get from X to Y."""
-    clusters = list()
-
-    positions_without_connections = set(positions.of_time_point(time_point))
+    # Union-find: every connection merges the trees of both positions, the smallest tree is hung under the largest.
+    # Only positions with connections are numbered, as most positions usually don't have any
+    connected_positions = list()
+    index_by_position = dict()
+    parents = list()
+    sizes = list()
     for position_a, position_b in connections.of_time_point(time_point):
-        _try_remove(positions_without_connections, position_a)
-        _try_remove(positions_without_connections, position_b)
+        indices = list()
+        for position in (position_a, position_b):
+            index = index_by_position.get(position)
+            if index is None:
+                index = len(connected_positions)
+                index_by_position[position] = index
+                connected_positions.append(position)
+                parents.append(index)
+                sizes.append(1)
+            indices.append(index)
 
-        cluster_of_a: Optional[Cluster] = None
-        cluster_of_b: Optional[Cluster] = None
-        for cluster in clusters:
-            if position_a in cluster.positions:
-                cluster_of_a = cluster
-            if position_b in cluster.positions:
-                cluster_of_b = cluster
+        root_a = _find_root(parents, indices[0])
+        root_b = _find_root(parents, indices[1])
+        if root_a == root_b:
+            continue  # Already in the same cluster
+        if sizes[root_a] < sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        parents[root_b] = root_a
+        sizes[root_a] += sizes[root_b]
 
-        # Now there are four possibilities
-        if cluster_of_a is None and cluster_of_b is None:
-            # Both are not in a cluster - add new cluster
-            clusters.append(Cluster(position_a, position_b))
-            continue
-        if cluster_of_a is not None and cluster_of_b is None:
-            # A is in a cluster, let B join that cluster
-            cluster_of_a.positions.add(position_b)
-            continue
-        if cluster_of_a is None and cluster_of_b is not None:
-            # B is in a cluster, let A join that cluster
-            cluster_of_b.positions.add(position_a)
-            continue
-        if cluster_of_a is not None and cluster_of_b is not None:
-            # Both are in clusters
-            if cluster_of_a is cluster_of_b:
-                # It's the same cluster, do nothing
-                continue
-            else:
-                # Merge both clusters
-                cluster_of_a.positions |= cluster_of_b.positions
-                clusters.remove(cluster_of_b)
-                continue
-        raise RuntimeError("Should not be able to get here")
+    # Every tree in the forest is a cluster
+    clusters_by_root: Dict[int, Cluster] = dict()
+    for index, position in enumerate(connected_positions):
+        root = _find_root(parents, index)
+        cluster = clusters_by_root.get(root)
+        if cluster is None:
+            clusters_by_root[root] = Cluster(position)
+        else:
+            cluster.positions.add(position)
+    clusters = list(clusters_by_root.values())
 
     # Add "clusters" of one position for all positions without connections
-    for position in positions_without_connections:
-        clusters.append(Cluster(position))
-
+    for position in positions.of_time_point(time_point):
+        if position not in index_by_position:
+            clusters.append(Cluster(position))
     return clusters
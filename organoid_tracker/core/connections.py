@@ -139,10 +139,13 @@ class Connections:
 
     def add_connection(self, position1: Position, position2: Position):
         """Adds a connection between the two positions. They must be in the same time point."""
-        position1.check_time_point(position2.time_point())
+        time_point_number = position1.time_point_number()
+        if time_point_number != position2.time_point_number():
+            # Compared directly instead of using check_time_point, so that no TimePoint object is needed
+            raise ValueError(f"Time points don't match: self is in {time_point_number}, other in"
+                             f" {position2.time_point_number()}")
         if position1 == position2:
             raise ValueError(f"Both provided positions are equal: {position1}")
-        time_point_number = position1.time_point_number()
         if time_point_number is None:
             raise ValueError(f"Please specify a time point number for {position1} and {position2}")
 
@@ -189,10 +189,10 @@ class Experiment:
         if first_number is None or last_number is None:
             return []
 
-        current_number = first_number
-        while current_number <= last_number:
-            yield self.get_time_point(current_number)
-            current_number += 1
+        # No need to use self.get_time_point(..), which would look up the first and last time point again for every
+        # time point
+        for time_point_number in range(first_number, last_number + 1):
+            yield TimePoint(time_point_number)
 
     def get_image_stack(self, time_point: TimePoint) -> Optional[ndarray]:
         """Gets a stack of all images for a time point, one for every z layer. Returns None if there is no image."""
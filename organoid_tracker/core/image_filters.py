@@ -1,4 +1,5 @@
 from abc import abstractmethod, ABC
+from collections import OrderedDict
 from typing import Optional, Dict, List, Iterable, Tuple
 
 from numpy import ndarray
@@ -30,10 +31,20 @@ class ImageFilter(ABC):
 
 
 class ImageFilters:
+    """All image filters, by channel. Filtered 2D images are cached, so if you modify a filter after adding it, you need
+    to remove and re-add the filters of that channel for the change to become visible."""
+
     _filters: Dict[ImageChannel, List[ImageFilter]]
 
+    # Filtered 2D images, so that going back to a recently viewed image doesn't require filtering it again. Stored as
+    # (time point number, channel, z) -> (unfiltered input image, filtered image). The least recently used image is
+    # removed first.
+    _filtered_2d_cache: "OrderedDict[Tuple[int, ImageChannel, int], Tuple[ndarray, ndarray]]"
+    _CACHE_SIZE: int = 20
+
     def __init__(self):
         self._filters = dict()
+        self._filtered_2d_cache = OrderedDict()
 
     def filter(self, time_point: TimePoint, image_channel: ImageChannel, image_z: Optional[int], array: Optional[ndarray]):
         """Applies the filters to the given array. For 2D arrays, supply an image_z. For 3D arrays, you use None
@@ -42,10 +53,25 @@ class ImageFilters:
             return None
 
         if image_channel in self._filters:
+            cache_key = None
+            if image_z is not None:
+                cache_key = (time_point.time_point_number(), image_channel, image_z)
+                cached = self._filtered_2d_cache.get(cache_key)
+                if cached is not None and cached[0] is array:
+                    # Already filtered this exact array
+                    self._filtered_2d_cache.move_to_end(cache_key)
+                    return cached[1]
+
             # Apply all filters (we need to make a copy of the array, otherwise we modify cached arrays)
             copied_array = array.copy()
             for image_filter in self._filters[image_channel]:
                 image_filter.filter(time_point, image_z, copied_array)
+
+            if cache_key is not None:
+                self._filtered_2d_cache.pop(cache_key, None)
+                if len(self._filtered_2d_cache) >= self._CACHE_SIZE:
+                    self._filtered_2d_cache.popitem(last=False)  # Removes the least recently used entry
+                self._filtered_2d_cache[cache_key] = (array, copied_array)
             return copied_array
 
         return array
@@ -54,9 +80,11 @@ class ImageFilters:
         """Removes all filters for the given channel."""
         if channel in self._filters:
             del self._filters[channel]
+            self._filtered_2d_cache.clear()
 
     def add_filter(self, channel: ImageChannel, filter: ImageFilter):
         """Adds a new filter for the given channel."""
+        self._filtered_2d_cache.clear()
         if channel not in self._filters:
             self._filters[channel] = [filter]
         else:
@@ -40,11 +40,18 @@ class ImageLoader(ABC):
         """Loads an image, usually from disk. Returns None if there is no image for this time point or channel."""
         pass
 
-    @abstractmethod
     def get_2d_image_array(self, time_point: TimePoint, image_channel: ImageChannel, image_z: int) -> Optional[ndarray]:
         """Loads one single 2d slice of an image. Returns None if there is no image for this z, time point or channel.
         Note: the image z always goes from 0 to image_size_z - 1.
+
+        The default implementation loads the full 3D image and returns one slice of it. Image loaders that can read
+        individual slices from disk (like a single TIFF page) should override this method, as the GUI only ever needs
+        one slice at a time.
         """
+        array = self.get_3d_image_array(time_point, image_channel)
+        if array is None or image_z < 0 or image_z >= array.shape[0]:
+            return None
+        return array[image_z]
 
     @abstractmethod
     def get_image_size_zyx(self) -> Optional[Tuple[int, int, int]]:
@@ -94,6 +101,11 @@ class ImageLoader(ABC):
         """Copies the image loader, so that you can use it on another thread."""
         pass
 
+    def close(self):
+        """Releases any resources (like background threads) held by this image loader. The loader can still be used
+        afterwards. The default implementation does nothing."""
+        pass
+
     def uncached(self) -> "ImageLoader":
         """If this loader is a caching wrapper around another loader, this method returns one loader below. Otherwise,
         it returns self.
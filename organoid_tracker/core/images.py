@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Dict, Optional, List, Tuple, Iterable, Union, Any
 
 import numpy
@@ -92,6 +93,111 @@ class _CachedImageLoader(ImageLoader):
     def copy(self) -> ImageLoader:
         return _CachedImageLoader(self._internal.copy())
 
+    def close(self):
+        self._internal.close()
+
+    def serialize_to_config(self) -> Tuple[str, str]:
+        return self._internal.serialize_to_config()
+
+    def serialize_to_dictionary(self) -> Dict[str, Any]:
+        return self._internal.serialize_to_dictionary()
+
+
+class _PrefetchingImageLoader(ImageLoader):
+    """Wrapper that loads the 2D images of the next few time points on a background thread, so that the disk access
+    overlaps with drawing the current time point. Images are prefetched in the direction that the user is moving
+    through the time-lapse."""
+
+    _PREFETCH_COUNT: int = 4
+
+    _internal: ImageLoader
+    _internal_for_thread: Optional[ImageLoader] = None  # Copy of _internal, only used on the prefetch thread
+    _executor: Optional[ThreadPoolExecutor] = None
+    _prefetched: Dict[Tuple[int, int, int], Future]  # (time point number, channel index, z) -> future of the image
+    _last_time_point_number: Optional[int] = None
+
+    def __init__(self, wrapped: ImageLoader):
+        self._internal = wrapped
+        self._prefetched = dict()
+
+    def get_3d_image_array(self, time_point: TimePoint, image_channel: ImageChannel) -> Optional[ndarray]:
+        return self._internal.get_3d_image_array(time_point, image_channel)
+
+    def get_2d_image_array(self, time_point: TimePoint, image_channel: ImageChannel, image_z: int) -> Optional[ndarray]:
+        time_point_number = time_point.time_point_number()
+        future = self._prefetched.pop((time_point_number, image_channel.index_zero, image_z), None)
+        if future is not None and not future.cancelled():
+            array = future.result()
+        else:
+            array = self._internal.get_2d_image_array(time_point, image_channel, image_z)
+        self._prefetch_after(time_point_number, image_channel, image_z)
+        return array
+
+    def _prefetch_after(self, time_point_number: int, image_channel: ImageChannel, image_z: int):
+        """Schedules loading of the next few time points, in the direction the user is currently moving in."""
+        first_time_point_number = self._internal.first_time_point_number()
+        last_time_point_number = self._internal.last_time_point_number()
+        if first_time_point_number is None or last_time_point_number is None:
+            return
+
+        direction = -1 if self._last_time_point_number is not None \
+                          and time_point_number < self._last_time_point_number else 1
+        self._last_time_point_number = time_point_number
+
+        wanted_keys = list()
+        for i in range(1, self._PREFETCH_COUNT + 1):
+            prefetch_time_point_number = time_point_number + i * direction
+            if first_time_point_number <= prefetch_time_point_number <= last_time_point_number:
+                wanted_keys.append((prefetch_time_point_number, image_channel.index_zero, image_z))
+
+        # Forget about images we no longer need (for example because the user moved to another z)
+        for key in list(self._prefetched.keys()):
+            if key not in wanted_keys:
+                self._prefetched.pop(key).cancel()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ImagePrefetcher")
+        for key in wanted_keys:
+            if key not in self._prefetched:
+                self._prefetched[key] = self._executor.submit(self._load_on_thread, TimePoint(key[0]),
+                                                              image_channel, image_z)
+
+    def close(self):
+        """Cancels all pending prefetches and stops the background thread. If images are requested afterwards, a new
+        thread is started. Does not close the wrapped image loader."""
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __del__(self):
+        self.close()
+
+    def _load_on_thread(self, time_point: TimePoint, image_channel: ImageChannel, image_z: int) -> Optional[ndarray]:
+        if self._internal_for_thread is None:
+            self._internal_for_thread = self._internal.copy()
+        return self._internal_for_thread.get_2d_image_array(time_point, image_channel, image_z)
+
+    def get_channel_count(self) -> int:
+        return self._internal.get_channel_count()
+
+    def get_image_size_zyx(self) -> Optional[Tuple[int, int, int]]:
+        return self._internal.get_image_size_zyx()
+
+    def uncached(self) -> ImageLoader:
+        return self._internal.uncached()
+
+    def first_time_point_number(self) -> Optional[int]:
+        return self._internal.first_time_point_number()
+
+    def last_time_point_number(self) -> Optional[int]:
+        return self._internal.last_time_point_number()
+
+    def copy(self) -> ImageLoader:
+        return _PrefetchingImageLoader(self._internal.copy())
+
     def serialize_to_config(self) -> Tuple[str, str]:
         return self._internal.serialize_to_config()
 
@@ -298,7 +404,8 @@ class Images:
     def image_loader(self, image_loader: Optional[ImageLoader] = None) -> ImageLoader:
         """Gets/sets the image loader. Note: images loaded directly from this image loader will be uncached."""
         if image_loader is not None:
-            self._image_loader = _CachedImageLoader(image_loader)
+            self._image_loader.close()  # Stops prefetching images from the old loader
+            self._image_loader = _CachedImageLoader(_PrefetchingImageLoader(image_loader))
             return image_loader
         return self._image_loader.uncached()
 
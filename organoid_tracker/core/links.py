@@ -341,6 +341,29 @@ class Links:
         track2._previous_tracks.append(track1)
         self._try_merge(track1, track2)
 
+    def add_track_of_positions(self, positions: List[Position]):
+        """Links all positions in the list to the next position in the list. The positions must be in consecutive time
+        points, starting with the earliest. This has the same result as calling add_link for every pair of positions,
+        but if none of the positions has any links yet, the track is created in one go."""
+        for i in range(1, len(positions)):
+            if positions[i].time_point_number() != positions[i - 1].time_point_number() + 1:
+                raise ValueError(f"Positions are not in consecutive time points: {positions[i - 1]} cannot be linked"
+                                 f" to {positions[i]}")
+        if len(positions) < 2:
+            return  # Nothing to link
+
+        for position in positions:
+            if position in self._position_to_track:
+                # Need to connect to existing tracks, so fall back to the normal method
+                for i in range(1, len(positions)):
+                    self.add_link(positions[i - 1], positions[i])
+                return
+
+        track = LinkingTrack(list(positions))
+        self._tracks.append(track)
+        for position in positions:
+            self._position_to_track[position] = track
+
     def get_lineage_data(self, track: LinkingTrack, data_name: str) -> Optional[DataType]:
         """Gets the attribute of the lineage tree. Returns None if not found."""
         # Find earliest track
@@ -719,18 +742,23 @@ class Links:
         in the given time point, the second one is one time point earlier or later."""
         time_point_number = time_point.time_point_number()
         for track in self._tracks:
-            track_min_time_point_number = track._min_time_point_number
-            if track_min_time_point_number > time_point_number:
-                continue
-            track_max_time_point_number = track.max_time_point_number()
-            if track_max_time_point_number < time_point_number:
-                continue
-            # Track crosses this time point
-            position = track.find_position_at_time_point_number(time_point_number)
-            for past_position in track._find_pasts(time_point_number):
-                yield position, past_position
-            for future_position in track._find_futures(time_point_number):
-                yield position, future_position
+            # Reads the positions list directly, as this method is called for every redraw of the screen
+            positions_by_time_point = track._positions_by_time_point
+            index = time_point_number - track._min_time_point_number
+            if index < 0 or index >= len(positions_by_time_point):
+                continue  # Track doesn't cross this time point
+
+            position = positions_by_time_point[index]
+            if index > 0:
+                yield position, positions_by_time_point[index - 1]
+            else:
+                for previous_track in track._previous_tracks:
+                    yield position, previous_track.find_last_position()
+            if index < len(positions_by_time_point) - 1:
+                yield position, positions_by_time_point[index + 1]
+            else:
+                for next_track in track._next_tracks:
+                    yield position, next_track.find_first_position()
 
     def get_track_id(self, track: LinkingTrack) -> Optional[int]:
         """Gets the track id of the given track. Returns None if the track is not stored in the linking data here."""
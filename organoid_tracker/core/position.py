@@ -20,12 +20,13 @@ class Position:
                         vector.z / resolution.pixel_size_z_um,
                         time_point=time_point, time_point_number=time_point_number)
 
-    __slots__ = ["x", "y", "z", "_time_point_number"]  # Optimization - Google "python slots"
+    __slots__ = ["x", "y", "z", "_time_point_number", "_hash"]  # Optimization - Google "python slots"
 
     x: float  # Read-only
     y: float  # Read-only
     z: float  # Read-only
     _time_point_number: Optional[int]
+    _hash: int
 
     def __init__(self, x: float, y: float, z: float, *,
                  time_point: Optional[TimePoint] = None, time_point_number: Optional[int] = None):
@@ -42,6 +43,11 @@ class Position:
         else:
             self._time_point_number = None
 
+        # Only based on int(x) and the time point, as __eq__ allows for a small difference in the coords. Hashing these
+        # as a tuple instead of XOR-ing them avoids that positions at many different (x, t) combinations collide. The
+        # hash is calculated only once, as positions are looked up in dictionaries all the time.
+        self._hash = hash((int(self.x), self._time_point_number))
+
     def distance_squared(self, other: "Position", resolution: ImageResolution) -> float:
         """Gets the squared distance in micrometers. Working with squared distances instead of normal ones gives a much
         better performance, as the expensive sqrt(..) function can be avoided."""
@@ -58,19 +64,26 @@ class Position:
         return self._time_point_number
 
     def __repr__(self):
-        string = "Position(" + ("%.2f" % self.x) + ", " + ("%.2f" % self.y) + ", " + ("%.0f" % self.z) + ")"
         if self._time_point_number is not None:
-            string += ".with_time_point_number(" + str(self._time_point_number) + ")"
-        return string
+            return f"Position({self.x:.2f}, {self.y:.2f}, {self.z:.0f})" \
+                   f".with_time_point_number({self._time_point_number})"
+        return f"Position({self.x:.2f}, {self.y:.2f}, {self.z:.0f})"
 
     def __str__(self):
-        string = "(" + ("%.2f" % self.x) + ", " + ("%.2f" % self.y) + ", " + ("%.2f" % self.z) + ")"
         if self._time_point_number is not None:
-            string += " at time point " + str(self._time_point_number)
-        return string
+            return f"({self.x:.2f}, {self.y:.2f}, {self.z:.2f}) at time point {self._time_point_number}"
+        return f"({self.x:.2f}, {self.y:.2f}, {self.z:.2f})"
 
     def __hash__(self) -> int:
-        return int(self.x) ^ hash(self._time_point_number)
+        return self._hash
+
+    def __getstate__(self):
+        # The hash is not stored, as hash(None) is not the same for every Python process
+        return self.x, self.y, self.z, self._time_point_number
+
+    def __setstate__(self, state):
+        x, y, z, time_point_number = state
+        self.__init__(x, y, z, time_point_number=time_point_number)
 
     def __eq__(self, other) -> bool:
         if other is None:
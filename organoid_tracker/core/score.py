@@ -13,39 +13,47 @@ class Score:
         # Results in score.total() == 7.1
     """
 
+    __slots__ = ["_scores"]
+
+    _scores: Dict[str, float]
+
     def __init__(self, **kwargs):
-        self.__dict__["scores"] = kwargs.copy()
+        object.__setattr__(self, "_scores", kwargs.copy())
 
     def __setattr__(self, key, value):
-        self.__dict__["scores"][key] = value
+        self._scores[key] = value
 
     def __getattr__(self, item):
-        return self.__dict__["scores"][item]
+        # Only called for the score names, the slot itself is found before this method is called
+        if item == "_scores":
+            raise AttributeError(item)  # Slot not yet initialized, must not recurse
+        try:
+            return self._scores[item]
+        except KeyError:
+            raise AttributeError(item)
 
     def __delattr__(self, item):
-        del self.__dict__["scores"][item]
+        del self._scores[item]
+
+    def __getstate__(self):
+        return self._scores
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_scores", state)
 
     def total(self):
-        score = 0
-        for name, value in self.__dict__["scores"].items():
-            score += value
-        return score
+        return sum(self._scores.values())
 
     def keys(self) -> List[str]:
-        keylist = list(self.__dict__["scores"].keys())
-        keylist.sort()
-        return keylist
+        return sorted(self._scores)
 
     def get(self, key: str) -> float:
         """Gets the specified score, or 0 if it does not exist"""
-        try:
-            return self.__dict__["scores"][key]
-        except KeyError:
-            return 0.0
+        return self._scores.get(key, 0.0)
 
     def dict(self) -> Dict[str, float]:
         """Gets the underlying score dictionary"""
-        return self.__dict__["scores"]
+        return self._scores
 
     def is_likely_mother(self):
         """Uses a simple threshold to check whether it is likely that this mother is a mother cell."""
@@ -56,38 +64,37 @@ class Score:
         return self.total() <= 1
 
     def __str__(self):
-        return str(self.total()) + " (based on " + str(self.__dict__["scores"]) + ")"
+        return str(self.total()) + " (based on " + str(self._scores) + ")"
 
     def __repr__(self):
-        return "Score(**" + repr(self.__dict__["scores"]) + ")"
+        return "Score(**" + repr(self._scores) + ")"
 
 
 class Family:
     """A mother cell with two daughter cells."""
     mother: Position
     daughters: Set[Position]  # Size of two, ensured by constructor.
+    _hash: int
 
     def __init__(self, mother: Position, daughter1: Position, daughter2: Position):
         """Creates a new family. daughter1 and daughter2 can be swapped without consequences."""
         self.mother = mother
         self.daughters = {daughter1, daughter2}
+        self._hash = hash((mother, frozenset(self.daughters)))  # Families are used as dict keys, so calculate only once
 
     @staticmethod
     def _pos_str(position: Position) -> str:
-        return "(" + ("%.2f" % position.x) + ", " + ("%.2f" % position.y) + ", " + ("%.0f" % position.z) + ")"
+        return f"({position.x:.2f}, {position.y:.2f}, {position.z:.0f})"
 
     def __str__(self):
-        return self._pos_str(self.mother) + " " + str(self.mother.time_point_number()) + "---> " \
+        return f"{self._pos_str(self.mother)} {self.mother.time_point_number()}---> " \
                + " and ".join([self._pos_str(daughter) for daughter in self.daughters])
 
     def __repr__(self):
         return "Family(" + repr(self.mother) + ", " +  ", ".join([repr(daughter) for daughter in self.daughters]) + ")"
 
     def __hash__(self):
-        hash_code = hash(self.mother)
-        for daughter in self.daughters:
-            hash_code += hash(daughter)
-        return hash_code
+        return self._hash
 
     def __eq__(self, other):
         return isinstance(other, self.__class__) \
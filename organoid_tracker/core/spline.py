@@ -2,6 +2,7 @@ import math
 from typing import List, Dict, Optional, Tuple, Iterable
 
 import numpy
+from numpy import ndarray
 from scipy import interpolate
 
 from organoid_tracker.core import TimePoint
@@ -15,6 +16,12 @@ from organoid_tracker.imaging import angles
 
 _REFERENCE = Vector3(0, 0, -1)
 
+# Number of points used to draw and measure along a spline. Splines are sampled every few pixels, but never with fewer
+# than _MIN_SAMPLE_COUNT points, so that short, curved splines are still followed closely.
+_SAMPLE_SPACING_PX = 10
+_MIN_SAMPLE_COUNT = 21
+_MAX_SAMPLE_COUNT = 201
+
 
 class SplinePosition:
     """Records a position projected on a spline: both the spline, its id, the position on the spline and the distance
@@ -48,7 +55,7 @@ class SplinePosition:
         next_position_on_axis = Position(next_position_on_axis[0], next_position_on_axis[1], self.spline.get_z()).to_vector_um(resolution)
         aa = _REFERENCE.cross(vector_towards_axis)
         bb = aa.dot(next_position_on_axis - closest_position_on_axis)
-        angle = numpy.sign(bb) * angle
+        angle = math.copysign(angle, bb) if bb != 0 else 0.0  # Scalar math, so no need for numpy.sign
 
         return angle
 
@@ -66,7 +73,9 @@ class Spline:
     _y_list: List[float]
     _z: Optional[int]
 
-    _interpolation: Optional[Tuple[List[float], List[float]]]
+    _interpolation: Optional[Tuple[ndarray, ndarray]]
+    _interpolation_lengths: Optional[ndarray]  # Combined length of all interpolated lines up to each point
+    _interpolation_lines: Optional[Tuple[ndarray, ndarray, ndarray, ndarray, ndarray]]  # x1, y1, dx, dy, length²
     _offset: float
 
     def __init__(self):
@@ -74,6 +83,8 @@ class Spline:
         self._y_list = []
         self._z = None
         self._interpolation = None
+        self._interpolation_lengths = None
+        self._interpolation_lines = None
         self._offset = 0
 
     def add_point(self, x: float, y: float, z: float):
@@ -91,11 +102,10 @@ class Spline:
 
     def length(self) -> float:
         """Gets the length of the spline."""
-        x_values, y_values = self.get_interpolation_2d()
-        combined_length = 0
-        for i in range(1, len(x_values)):
-            combined_length += _distance(x_values[i], y_values[i], x_values[i - 1], y_values[i - 1])
-        return combined_length
+        interpolation_lengths = self._get_interpolation_lengths()
+        if len(interpolation_lengths) == 0:
+            return 0
+        return float(interpolation_lengths[-1])
 
     def get_z(self) -> int:
         """Gets the Z coord of this path. Raises ValueError if the path has no points."""
@@ -103,23 +113,58 @@ class Spline:
             raise ValueError("Empty path, so no z is set")
         return self._z
 
-    def get_interpolation_2d(self) -> Tuple[List[float], List[float]]:
-        """Returns a (cached) list of x and y values that are used for interpolation."""
+    def get_interpolation_2d(self) -> Tuple[ndarray, ndarray]:
+        """Returns a (cached) array of x and y values that are used for interpolation."""
         if self._interpolation is None:
             self._interpolation = self._calculate_interpolation()
+            self._interpolation_lengths = None  # Needs to be recalculated too
+            self._interpolation_lines = None
         return self._interpolation
 
-    def _calculate_interpolation(self) -> Tuple[List[float], List[float]]:
+    def _get_interpolation_lengths(self) -> ndarray:
+        """Returns a (cached) array with, for every point in the interpolation, the combined length of all lines
+        before it. So the first value is 0, the second the length of the first line, etc."""
+        x_values, y_values = self.get_interpolation_2d()
+        if self._interpolation_lengths is None:
+            line_lengths = numpy.sqrt(numpy.diff(x_values) ** 2 + numpy.diff(y_values) ** 2)
+            self._interpolation_lengths = numpy.concatenate(([0.0], numpy.cumsum(line_lengths)))
+        return self._interpolation_lengths
+
+    def _get_interpolation_lines(self) -> Tuple[ndarray, ndarray, ndarray, ndarray, ndarray]:
+        """Returns (cached) arrays describing the lines between the interpolated points: the start x and y, the dx and
+        dy towards the end point, and the squared length."""
+        x_values, y_values = self.get_interpolation_2d()
+        if self._interpolation_lines is None:
+            line_x1 = x_values[:-1]
+            line_y1 = y_values[:-1]
+            line_dx = x_values[1:] - line_x1
+            line_dy = y_values[1:] - line_y1
+            self._interpolation_lines = line_x1, line_y1, line_dx, line_dy, line_dx * line_dx + line_dy * line_dy
+        return self._interpolation_lines
+
+    def _calculate_interpolation(self) -> Tuple[ndarray, ndarray]:
         if len(self._x_list) <= 1:
             # Not possible to interpolate
-            return self._x_list, self._y_list
+            return numpy.array(self._x_list, dtype=numpy.float64), numpy.array(self._y_list, dtype=numpy.float64)
+
+        # Sample the spline roughly every few pixels, so that long splines are still followed closely
+        polygon_length = float(numpy.hypot(numpy.diff(self._x_list), numpy.diff(self._y_list)).sum())
+        sample_count = min(max(int(polygon_length / _SAMPLE_SPACING_PX), _MIN_SAMPLE_COUNT), _MAX_SAMPLE_COUNT)
+
+        if len(self._x_list) == 2:
+            # A spline through two points is just a straight line, so no need to set up SciPy. We still sample the same
+            # points on it, as to_position_on_axis depends on how the line is divided into segments
+            return numpy.linspace(self._x_list[0], self._x_list[1], sample_count), \
+                numpy.linspace(self._y_list[0], self._y_list[1], sample_count)
+
+        sample_points = numpy.linspace(0, 1, sample_count)
 
         k = 3 if len(self._x_list) > 3 else 1
         # noinspection PyTupleAssignmentBalance
         spline, _ = interpolate.splprep([self._x_list, self._y_list], k=k)
-        points = interpolate.splev(numpy.arange(0, 1.01, 0.05), spline)
-        x_values = points[0]
-        y_values = points[1]
+        points = interpolate.splev(sample_points, spline)
+        x_values = numpy.ascontiguousarray(points[0], dtype=numpy.float64)
+        y_values = numpy.ascontiguousarray(points[1], dtype=numpy.float64)
         return x_values, y_values
 
     def to_position_on_axis(self, position: Position) -> Optional[SplinePosition]:
@@ -129,34 +174,40 @@ class Spline:
         if len(x_values) < 2:
             return None
 
-        # Find out which line segment is closest by
-        min_distance_to_line_squared = None
-        closest_line_index = None  # 1 for the first line, etc. Line 1 is from point 0 to point 1.
-        for i in range(1, len(x_values)):
-            line_x1 = x_values[i - 1]
-            line_y1 = y_values[i - 1]
-            line_x2 = x_values[i]
-            line_y2 = y_values[i]
-            distance_squared = _distance_to_line_segment_squared(line_x1, line_y1, line_x2, line_y2, position.x,
-                                                                 position.y)
-            if min_distance_to_line_squared is None or distance_squared < min_distance_to_line_squared:
-                min_distance_to_line_squared = distance_squared
-                closest_line_index = i
-
-        # Calculate length to beginning of line segment
-        combined_length_of_previous_lines = 0
-        for i in range(1, closest_line_index):
-            combined_length_of_previous_lines += _distance(x_values[i], y_values[i], x_values[i - 1], y_values[i - 1])
+        raw_path_positions, distances = self._to_raw_positions_on_axis_2d(numpy.array([position.x]),
+                                                                          numpy.array([position.y]))
+        return SplinePosition(self, float(raw_path_positions[0]) - self._offset, float(distances[0]))
 
-        # Calculate length on line segment
-        distance_to_start_of_line_squared = _distance_squared(x_values[closest_line_index - 1],
-                                                              y_values[closest_line_index - 1],
-                                                              position.x, position.y)
-        distance_on_line = numpy.sqrt(distance_to_start_of_line_squared - min_distance_to_line_squared)
+    def _to_raw_positions_on_axis_2d(self, xs: ndarray, ys: ndarray) -> Tuple[ndarray, ndarray]:
+        """Vectorized version of to_position_on_axis, for many positions at once. Returns the positions on the axis,
+        without the offset applied, and the distances to the axis. The spline must have at least two points."""
+        x_values, y_values = self.get_interpolation_2d()
+        xs = xs[:, numpy.newaxis]  # Rows are the positions, columns are the line segments
+        ys = ys[:, numpy.newaxis]
+
+        # Find out which line segment is closest by, by calculating the distance to all line segments at once
+        line_x1, line_y1, line_dx, line_dy, line_length_squared = self._get_interpolation_lines()
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            t = ((xs - line_x1) * line_dx + (ys - line_y1) * line_dy) / line_length_squared
+        t = numpy.where(line_length_squared == 0, 0, numpy.clip(t, 0, 1))  # For zero-length lines, use the start point
+        distances_to_line_squared = (xs - (line_x1 + t * line_dx)) ** 2 + (ys - (line_y1 + t * line_dy)) ** 2
+        closest_line_indices = distances_to_line_squared.argmin(axis=1)  # 0 for the first line, from point 0 to 1
+        min_distances_to_line_squared = numpy.take_along_axis(distances_to_line_squared,
+                                                              closest_line_indices[:, numpy.newaxis], axis=1)[:, 0]
+        xs = xs[:, 0]
+        ys = ys[:, 0]
+
+        # Look up length to beginning of line segment
+        combined_lengths_of_previous_lines = self._get_interpolation_lengths()[closest_line_indices]
 
-        raw_path_position = combined_length_of_previous_lines + distance_on_line
+        # Calculate length on line segment
+        # (maximum(0, ...) protects against rounding errors for positions right next to the start of a line)
+        distances_to_start_of_line_squared = (x_values[closest_line_indices] - xs) ** 2 \
+                                             + (y_values[closest_line_indices] - ys) ** 2
+        distances_on_line = numpy.sqrt(numpy.maximum(0, distances_to_start_of_line_squared
+                                                     - min_distances_to_line_squared))
 
-        return SplinePosition(self, raw_path_position - self._offset, math.sqrt(min_distance_to_line_squared))
+        return combined_lengths_of_previous_lines + distances_on_line, numpy.sqrt(min_distances_to_line_squared)
 
     def from_position_on_axis(self, path_position: float) -> Optional[Tuple[float, float]]:
         """Given a path position, this returns the corresponding x and y coordinates. Returns None for positions outside
@@ -166,23 +217,20 @@ class Spline:
         raw_path_position = path_position + self._offset
         if raw_path_position < 0:
             return None
-        line_index = 1
         x_values, y_values = self.get_interpolation_2d()
+        interpolation_lengths = self._get_interpolation_lengths()
 
-        while True:
-            line_length = _distance(x_values[line_index - 1], y_values[line_index - 1],
-                                    x_values[line_index], y_values[line_index])
-            if raw_path_position < line_length or line_index == len(x_values) - 1:
-                # If the position is on this line segment, or it's the last line segment, then interpolate (or
-                # extrapolate) the position on that line
-                line_dx = x_values[line_index] - x_values[line_index - 1]
-                line_dy = y_values[line_index] - y_values[line_index - 1]
-                travelled_fraction = raw_path_position / line_length
-                return x_values[line_index - 1] + line_dx * travelled_fraction, \
-                       y_values[line_index - 1] + line_dy * travelled_fraction
-
-            raw_path_position -= line_length
-            line_index += 1
+        # Find the line segment the position is on. If the position is beyond the end of the spline, then we use the
+        # last line segment, so that we extrapolate the position on that line
+        line_index = int(numpy.searchsorted(interpolation_lengths, raw_path_position, side="right"))
+        line_index = min(max(line_index, 1), len(x_values) - 1)  # Line 1 is from point 0 to point 1
+
+        line_dx = x_values[line_index] - x_values[line_index - 1]
+        line_dy = y_values[line_index] - y_values[line_index - 1]
+        line_length = interpolation_lengths[line_index] - interpolation_lengths[line_index - 1]
+        travelled_fraction = (raw_path_position - interpolation_lengths[line_index - 1]) / line_length
+        return x_values[line_index - 1] + line_dx * travelled_fraction, \
+               y_values[line_index - 1] + line_dy * travelled_fraction
 
     def get_direction_marker(self) -> str:
         """Returns a char thar represents the general direction of this path: ">", "<", "^" or "v". The (0,0) coord
@@ -205,15 +253,23 @@ class Spline:
     def copy(self) -> "Spline":
         """Returns a copy of this path. Changes to this path will not affect the copy and vice versa."""
         copy = Spline()
-        for i in range(len(self._x_list)):
-            copy.add_point(self._x_list[i], self._y_list[i], self._z)
+        copy._x_list = list(self._x_list)
+        copy._y_list = list(self._y_list)
+        copy._z = self._z
         copy._offset = self._offset
+
+        # The points are the same, so the interpolation is too. The cached arrays are never modified in place (they're
+        # replaced when the points change), so they can be shared
+        copy._interpolation = self._interpolation
+        copy._interpolation_lengths = self._interpolation_lengths
+        copy._interpolation_lines = self._interpolation_lines
         return copy
 
     def remove_point(self, x: float, y: float):
         """Removes the point that is (within 1 px) at the given coords. Does nothing if there is no such point."""
-        for i in range(len(self._x_list)):
-            if abs(self._x_list[i] - x) < 1 and abs(self._y_list[i] - y) < 1:
+        # Note: points cannot be swapped around to make removal cheaper, as their order defines the shape of the spline
+        for i, (point_x, point_y) in enumerate(zip(self._x_list, self._y_list)):
+            if abs(point_x - x) < 1 and abs(point_y - y) < 1:
                 del self._x_list[i]
                 del self._y_list[i]
                 self._interpolation = None  # Interpolation is now outdated
@@ -226,13 +282,15 @@ class Spline:
         if len(self._x_list) < 2:
             return  # Too small path to update
 
-        current_lowest_position = None
-        for position in positions:
-            path_position = self.to_position_on_axis(position).pos
-            if current_lowest_position is None or path_position < current_lowest_position:
-                current_lowest_position = path_position
-        if current_lowest_position is not None:  # Don't do anything if the list of positions was empty
-            self._offset += current_lowest_position
+        positions = list(positions)
+        if len(positions) == 0:
+            return  # Don't do anything if the list of positions was empty
+
+        # Calculate all path positions at once
+        raw_path_positions, _ = self._to_raw_positions_on_axis_2d(numpy.array([position.x for position in positions]),
+                                                                  numpy.array([position.y for position in positions]))
+        current_lowest_position = float(raw_path_positions.min()) - self._offset
+        self._offset += current_lowest_position
 
     def set_offset(self, offset: float):
         """Manually sets the offset used in calls to get_path_position_2d and path_position_to_xy. See also
@@ -252,24 +310,80 @@ class Spline:
 
         self._interpolation = None  # Invalidate previous interpolation
 
-def _distance(x1, y1, x2, y2):
-    """Distance between two points."""
-    return numpy.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
-
-
-def _distance_squared(vx, vy, wx, wy):
-    return (vx - wx) ** 2 + (vy - wy) ** 2
 
+class _CombinedSplineLines:
+    """The interpolated lines of several splines, stored together in a single set of arrays. This allows you to find
+    the closest line over all splines at once, instead of looping over the splines."""
+
+    _spline_ids: List[int]
+    _splines: List[Spline]
+    _interpolations: List[Tuple[ndarray, ndarray]]  # Used to detect whether the splines have changed since
+
+    _line_x1: ndarray
+    _line_y1: ndarray
+    _line_dx: ndarray
+    _line_dy: ndarray
+    _line_length_squared: ndarray
+    _line_start_lengths: ndarray  # Length along the spline up to the start of every line
+    _line_spline_indices: ndarray  # Index in self._splines of every line
+
+    def __init__(self, splines: List[Tuple[int, Spline]]):
+        self._spline_ids = [spline_id for spline_id, spline in splines]
+        self._splines = [spline for spline_id, spline in splines]
+        self._interpolations = [spline.get_interpolation_2d() for spline in self._splines]
+
+        line_arrays = [list() for _ in range(6)]
+        line_spline_indices = list()
+        for i, spline in enumerate(self._splines):
+            if len(self._interpolations[i][0]) < 2:
+                continue  # Spline has no lines
+            for line_array, values in zip(line_arrays, spline._get_interpolation_lines()
+                                                       + (spline._get_interpolation_lengths()[:-1],)):
+                line_array.append(values)
+            line_spline_indices.append(numpy.full(len(line_arrays[0][-1]), i))
+        self._line_x1, self._line_y1, self._line_dx, self._line_dy, self._line_length_squared, \
+            self._line_start_lengths = [numpy.concatenate(line_array) if len(line_array) > 0 else numpy.empty(0)
+                                        for line_array in line_arrays]
+        self._line_spline_indices = numpy.concatenate(line_spline_indices) if len(line_spline_indices) > 0 \
+            else numpy.empty(0, dtype=int)
+
+    def is_up_to_date(self, splines: List[Tuple[int, Spline]]) -> bool:
+        """Checks whether these lines still represent the given splines."""
+        if len(splines) != len(self._splines):
+            return False
+        for i, (spline_id, spline) in enumerate(splines):
+            if spline_id != self._spline_ids[i] or spline is not self._splines[i] \
+                    or spline.get_interpolation_2d() is not self._interpolations[i]:
+                return False
+        return True
+
+    def to_position_on_spline(self, position: Position) -> Optional[SplinePosition]:
+        """Gets the position on the closest spline. Returns None if none of the splines has at least two points."""
+        if len(self._line_x1) == 0:
+            return None
 
-def _distance_to_line_segment_squared(line_x1, line_y1, line_x2, line_y2, point_x, point_y):
-    """Distance from point to a line defined by the points (line_x1, line_y1) and (line_x2, line_y2)."""
-    l2 = _distance_squared(line_x1, line_y1, line_x2, line_y2)
-    if l2 == 0:
-        return _distance_squared(point_x, point_y, line_x1, line_y1)
-    t = ((point_x - line_x1) * (line_x2 - line_x1) + (point_y - line_y1) * (line_y2 - line_y1)) / l2
-    t = max(0, min(1, t))
-    return _distance_squared(point_x, point_y,
-                             line_x1 + t * (line_x2 - line_x1), line_y1 + t * (line_y2 - line_y1))
+        # Same calculation as in Spline._to_raw_positions_on_axis_2d, but now for one position and all lines
+        x = position.x
+        y = position.y
+        line_x1, line_y1, line_dx, line_dy = self._line_x1, self._line_y1, self._line_dx, self._line_dy
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            t = ((x - line_x1) * line_dx + (y - line_y1) * line_dy) / self._line_length_squared
+        t = numpy.where(self._line_length_squared == 0, 0, numpy.clip(t, 0, 1))
+        distances_to_line_squared = (x - (line_x1 + t * line_dx)) ** 2 + (y - (line_y1 + t * line_dy)) ** 2
+        closest_line_index = int(distances_to_line_squared.argmin())
+        min_distance_to_line_squared = float(distances_to_line_squared[closest_line_index])
+
+        distance_to_start_of_line_squared = (float(line_x1[closest_line_index]) - x) ** 2 \
+                                            + (float(line_y1[closest_line_index]) - y) ** 2
+        distance_on_line = math.sqrt(max(0.0, distance_to_start_of_line_squared - min_distance_to_line_squared))
+        raw_path_position = float(self._line_start_lengths[closest_line_index]) + distance_on_line
+
+        spline_index = int(self._line_spline_indices[closest_line_index])
+        spline = self._splines[spline_index]
+        spline_position = SplinePosition(spline, raw_path_position - spline.get_offset(),
+                                         math.sqrt(min_distance_to_line_squared))
+        spline_position.spline_id = self._spline_ids[spline_index]
+        return spline_position
 
 
 class SplineCollection:
@@ -282,6 +396,9 @@ class SplineCollection:
     _max_time_point_number: Optional[int]
     _reference_time_point: Optional[TimePoint]
 
+    # Lines of all splines of a time point combined, by (time point number, only_axis). Rebuilt when outdated.
+    _combined_lines: Dict[Tuple[int, bool], _CombinedSplineLines]
+
     def __init__(self):
         self._splines = dict()
         self._spline_markers = dict()
@@ -289,6 +406,7 @@ class SplineCollection:
         self._min_time_point_number = None
         self._max_time_point_number = None
         self._reference_time_point = None
+        self._combined_lines = dict()
 
     def first_time_point_number(self) -> Optional[int]:
         """Gets the first time point that contains data axes, or None if there are no axes stored."""
@@ -333,18 +451,18 @@ class SplineCollection:
 
     def to_position_on_spline(self, position: Position, only_axis=False) -> Optional[SplinePosition]:
         # Find the closest axis, return position on that axis
-        lowest_distance_position = None
-        for axis_id, data_axis in self.of_time_point(position.time_point()):
-            if only_axis and not self._spline_is_axis.get(axis_id):
-                continue  # Ignore axes of this type
-
-            axis_position = data_axis.to_position_on_axis(position)
-            if axis_position is None:
-                continue
-            axis_position.spline_id = axis_id
-            if lowest_distance_position is None or axis_position.distance < lowest_distance_position.distance:
-                lowest_distance_position = axis_position
-        return lowest_distance_position
+        splines = [(spline_id, spline) for spline_id, spline in self.of_time_point(position.time_point())
+                   if not only_axis or self._spline_is_axis.get(spline_id)]
+        if len(splines) == 0:
+            return None
+
+        # Search all lines of all splines at once
+        cache_key = (position.time_point_number(), bool(only_axis))
+        combined_lines = self._combined_lines.get(cache_key)
+        if combined_lines is None or not combined_lines.is_up_to_date(splines):
+            combined_lines = _CombinedSplineLines(splines)
+            self._combined_lines[cache_key] = combined_lines
+        return combined_lines.to_position_on_spline(position)
 
     def to_position_on_original_axis(self, links: Links, position: Position) -> Optional[SplinePosition]:
         """Gets the position on the axis that was closest in the first time point this position appeared. In this way,
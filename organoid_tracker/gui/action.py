@@ -1,7 +1,4 @@
-from typing import Optional, Iterable, List, Any, Dict
-
-from PySide2.QtWidgets import QApplication
-from matplotlib.figure import Figure
+from typing import Optional, Iterable, List, Any, Dict, TYPE_CHECKING
 
 from organoid_tracker.core import UserError
 from organoid_tracker.core.experiment import Experiment
@@ -15,6 +12,9 @@ from organoid_tracker.linking_analysis import linking_markers
 from organoid_tracker.visualizer import activate
 from organoid_tracker.visualizer.empty_visualizer import EmptyVisualizer
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 
 def ask_save_unsaved_changes(tabs: Iterable[SingleGuiTab]) -> bool:
     """If there are any unsaved changes, this method will prompt the user to save them. Returns True if the user either
@@ -38,7 +38,7 @@ def ask_save_unsaved_changes(tabs: Iterable[SingleGuiTab]) -> bool:
     return True
 
 
-def toggle_axis(figure: Figure):
+def toggle_axis(figure: "Figure"):
     """Toggles whether the axes are visible."""
     set_visible = None
     for axis in figure.axes:
@@ -46,7 +46,7 @@ def toggle_axis(figure: Figure):
             set_visible = not axis.get_xaxis().get_visible()
         axis.get_xaxis().set_visible(set_visible)
         axis.get_yaxis().set_visible(set_visible)
-    figure.canvas.draw()
+    figure.canvas.draw_idle()
 
 
 def new(window: Window):
@@ -233,7 +233,7 @@ def view_statistics(window: Window):
     time_point_count = experiment.last_time_point_number() - experiment.first_time_point_number() + 1
     position_count = len(experiment.positions)
     links_count = len(experiment.links)
-    errors_count = sum(1 for error in linking_markers.find_errored_positions(experiment.position_data))
+    errors_count = linking_markers.count_errored_positions(experiment.position_data)
     errors_percentage = errors_count/position_count*100 if position_count > 0 else 0
     dialog.popup_message("Statistics", f"There are {time_point_count} time points loaded. {position_count} positions "
                                        f" are annotated and {links_count} links have been created."
@@ -244,6 +244,7 @@ def view_statistics(window: Window):
 def ask_exit(gui_experiment: GuiExperiment):
     """Asks to save unsaved changes, then exits."""
     if ask_save_unsaved_changes(gui_experiment.get_all_tabs()):
+        from PySide2.QtWidgets import QApplication
         QApplication.quit()
 
 
@@ -1,3 +1,5 @@
+from typing import Callable, Dict
+
 from organoid_tracker.core.experiment import Experiment
 from organoid_tracker.gui import dialog, option_choose_dialog
 from organoid_tracker.imaging.image_file_name_pattern_finder import find_time_and_channel_pattern
@@ -10,34 +12,50 @@ def prompt_image_series(experiment: Experiment) -> bool:
         ("Single TIF or TIF series", "*.tif *.tiff"),
         ("Image per time point", "*.png *.jpg *.gif"),
         ("LIF file", "*.lif"),
-        ("ND2 file", "*.nd2")])
+        ("ND2 file", "*.nd2"),
+        ("Zarr array", ".zarray")])
     if not full_path:
         return False  # Cancelled
     directory, file_name = os.path.split(full_path)
 
-    if file_name.endswith(".lif"):
-        # LIF file loading
-        from organoid_tracker.image_loading import _lif, liffile_image_loader
-        reader = _lif.Reader(full_path)
-        series = [header.getName() for header in reader.getSeriesHeaders()]
-        series_index = option_choose_dialog.prompt_list("Choose an image serie", "Choose an image serie", "Image serie:", series)
-        if series_index is not None:
-            liffile_image_loader.load_from_lif_reader(experiment, full_path, reader, series_index)
-            return True
-        return False
-
-    if file_name.endswith(".nd2"):
-        # ND2 file loading
-        from organoid_tracker.image_loading import nd2file_image_loader
-        reader = nd2file_image_loader.Nd2File(full_path)
-        max_location = reader.get_location_counts()
-        location = dialog.prompt_int("Image series", f"Which image series do you want load? (1-"
-                                     f"{max_location}, inclusive)", minimum=1, maximum=max_location)
-        if location is not None:
-            nd2file_image_loader.load_image_series(experiment, reader, location)
-            return True
-        return False
+    if file_name == ".zarray":
+        # Zarr arrays are directories, the .zarray file in there describes the array
+        from organoid_tracker.image_loading import zarr_image_loader
+        zarr_image_loader.load_from_zarr_file(experiment, directory)
+        return True
+
+    extension = os.path.splitext(file_name)[1].lower()
+    load_function = _LOAD_FUNCTIONS_BY_EXTENSION.get(extension, _load_file_series)
+    return load_function(experiment, directory, file_name)
+
+
+def _load_lif(experiment: Experiment, directory: str, file_name: str) -> bool:
+    from organoid_tracker.image_loading import _lif, liffile_image_loader
+    full_path = os.path.join(directory, file_name)
+    reader = _lif.Reader(full_path)
+    series = [header.getName() for header in reader.getSeriesHeaders()]
+    series_index = option_choose_dialog.prompt_list("Choose an image serie", "Choose an image serie", "Image serie:", series)
+    if series_index is not None:
+        liffile_image_loader.load_from_lif_reader(experiment, full_path, reader, series_index)
+        return True
+    return False
 
+
+def _load_nd2(experiment: Experiment, directory: str, file_name: str) -> bool:
+    from organoid_tracker.image_loading import nd2file_image_loader
+    reader = nd2file_image_loader.Nd2File(os.path.join(directory, file_name))
+    max_location = reader.get_location_counts()
+    location = dialog.prompt_int("Image series", f"Which image series do you want load? (1-"
+                                 f"{max_location}, inclusive)", minimum=1, maximum=max_location)
+    if location is not None:
+        nd2file_image_loader.load_image_series(experiment, reader, location)
+        return True
+    return False
+
+
+def _load_file_series(experiment: Experiment, directory: str, file_name: str) -> bool:
+    """Loads a series of image files, one per time point. Falls back to loading a single (TIF) file if no time pattern
+    can be found in the file name."""
     file_name_pattern = find_time_and_channel_pattern(file_name)
     if file_name_pattern is None:
         file_name_pattern = file_name  # Don't use a pattern if not available
@@ -45,7 +63,7 @@ def prompt_image_series(experiment: Experiment) -> bool:
         if file_name_lower.endswith(".tif") or file_name_lower.endswith(".tiff"):
             # Try as TIF container
             from organoid_tracker.image_loading import merged_tiff_image_loader
-            merged_tiff_image_loader.load_from_tif_file(experiment, full_path)
+            merged_tiff_image_loader.load_from_tif_file(experiment, os.path.join(directory, file_name))
             return True
         dialog.popup_message("Could not read file pattern", "Could not find 't01' (or similar) in the file name \"" +
                              file_name + "\", so only one image is loaded. If you want to load a time lapse, see the"
@@ -55,3 +73,10 @@ def prompt_image_series(experiment: Experiment) -> bool:
     from organoid_tracker.image_loading import folder_image_loader
     folder_image_loader.load_images_from_folder(experiment, directory, file_name_pattern)
     return True
+
+
+# Container formats that need a special loader, by lowercase file extension. All other files are loaded as a series
+_LOAD_FUNCTIONS_BY_EXTENSION: Dict[str, Callable[[Experiment, str, str], bool]] = {
+    ".lif": _load_lif,
+    ".nd2": _load_nd2
+}
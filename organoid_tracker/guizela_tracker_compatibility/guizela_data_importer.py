@@ -1,14 +1,12 @@
 """Extracting the tracks as measured by Guizela to a Graph object"""
 
-import math
 import os
 import pickle
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 
-import numpy
-
 from organoid_tracker.core import TimePoint
 from organoid_tracker.core.experiment import Experiment
 from organoid_tracker.core.links import Links
@@ -35,9 +33,9 @@ def _load_links(experiment: Experiment, tracks_dir: str, min_time_point: int = 0
     _read_lineage_file(tracks_dir, links, tracks, min_time_point=min_time_point, max_time_point=max_time_point)
 
     # Also add as positions
-    positions = experiment.positions
+    add_position = experiment.positions.add
     for position in experiment.links.find_all_positions():
-        positions.add(position)
+        add_position(position)
 
     _read_deaths_file(tracks_dir, position_data, tracks, min_time_point=min_time_point, max_time_point=max_time_point)
     for cell_type, file_name in cell_type_converter.CELL_TYPE_TO_FILE.items():
@@ -80,33 +78,45 @@ def add_data_to_experiment(experiment: Experiment, tracks_dir: str, min_time_poi
 def _read_track_files(tracks_dir: str, experiment: Experiment, min_time_point: int = 0, max_time_point: int = 5000
                       ) -> Dict[int, Track]:
     """Adds all tracks to the graph, and returns the original tracks"""
-    track_files = os.listdir(tracks_dir)
-    print("Found " + str(len(track_files)) + " files to analyse")
-
-    tracks = dict()
+    # Find all track files using a single directory listing, without checking the files one by one
     track_file_pattern = re.compile(r"^track_([0-9]{5})\.p$")
+    track_files = list()
+    with os.scandir(tracks_dir) as entries:
+        for entry in entries:
+            match = track_file_pattern.match(entry.name)
+            if match is not None:
+                track_files.append((int(match.group(1)), entry.path))
+    track_files.sort()
+    print("Found " + str(len(track_files)) + " track files to analyse")
 
+    tracks = dict()
     track_counter = 1
-    for track_file in track_files:
-        match = track_file_pattern.match(track_file)
-        if match is None:
-            continue
-        track_index = int(match.group(1))
-        track_file = os.path.join(tracks_dir, track_file)
-        if not os.path.exists(track_file):
-            break
 
-        if track_counter % 10 == 0:
-            print("Reading track " + str(track_counter))
+    # Reading the files is done on multiple threads, as that is mostly waiting for the disk. Unpickling and adding the
+    # links is still done here, in order of the track index.
+    with ThreadPoolExecutor(max_workers=8, thread_name_prefix="TrackFileReader") as executor:
+        track_file_contents = executor.map(_read_file_bytes, [track_file for _, track_file in track_files])
+        for (track_index, _), track_file_content in zip(track_files, track_file_contents):
+            if track_counter % 10 == 0:
+                print("Reading track " + str(track_counter))
 
-        # Note that the first track will get id 0, the second id 1, etc. This is required for the lineages file
-        tracks[track_index] = _extract_links_from_track(track_file, experiment, min_time_point=min_time_point, max_time_point=max_time_point)
+            # Note that the first track will get id 0, the second id 1, etc. This is required for the lineages file
+            # The files were written by Python 2, so both encoding='latin1' and fix_imports (on by default) are needed
+            # to read the NumPy arrays in them
+            track = pickle.loads(track_file_content, encoding='latin1')
+            _extract_links_from_track(track, experiment, min_time_point=min_time_point, max_time_point=max_time_point)
+            tracks[track_index] = track
 
-        track_counter += 1
+            track_counter += 1
 
     return tracks
 
 
+def _read_file_bytes(file: str) -> bytes:
+    with open(file, "rb") as file_handle:
+        return file_handle.read()
+
+
 def _read_lineage_file(tracks_dir: str, links: Links, tracks: Dict[int, Track], min_time_point: int = 0,
                        max_time_point: int = 5000) -> None:
     """Connects the lineages in the graph based on information from the lineages.p file"""
@@ -124,7 +134,7 @@ def _read_lineage_file(tracks_dir: str, links: Links, tracks: Dict[int, Track],
             child_track_1 = tracks[lineage[1]]
             child_track_2 = tracks[lineage[2]]
 
-            first_time_point_after_division = numpy.amin(child_track_1.t)
+            first_time_point_after_division = int(child_track_1.t[0])  # Track.add_point keeps the time points sorted
             if first_time_point_after_division - 1 < min_time_point or first_time_point_after_division > max_time_point:
                 continue
 
@@ -194,34 +204,30 @@ def _get_cell_in_time_point(track: Track, time_point_number: int) -> Optional[Po
     return Position(position_array[0], position_array[1], position_array[2], time_point_number=time_point_number)
 
 
-def _extract_links_from_track(track_file: str, experiment: Experiment, min_time_point: int = 0,
-                              max_time_point: int = 5000) -> Track:
-    links = experiment.links
-    positions = experiment.positions
-    with open(track_file, "rb") as file_handle:
-        track = pickle.load(file_handle, encoding='latin1')
-        current_position = None
-
-        for time_point in track.t:
-            if time_point < min_time_point or time_point > max_time_point:
-                continue
+def _extract_links_from_track(track: Track, experiment: Experiment, min_time_point: int = 0,
+                              max_time_point: int = 5000):
+    add_position = experiment.positions.add
+    linked_positions = list()  # Positions in consecutive time points, will be linked to each other at the end
 
-            previous_position = current_position
-            current_position = _get_cell_in_time_point(track, time_point)
-            if math.isnan(current_position.x + current_position.y + current_position.z):
-                print("Warning: found invalid " + str(current_position))
-                continue
-
-            positions.add(current_position)
-            if previous_position is not None:
-                while previous_position.time_point_number() < current_position.time_point_number() - 1:
-                    temp_position = previous_position.with_time_point_number(previous_position.time_point_number() + 1)
-                    links.add_link(previous_position, temp_position)
-                    previous_position = temp_position
-
-                links.add_link(previous_position, current_position)
+    for time_point in track.t:
+        if time_point < min_time_point or time_point > max_time_point:
+            continue
 
-        return track
+        position = _get_cell_in_time_point(track, time_point)
+        if position.x != position.x or position.y != position.y or position.z != position.z:  # Checks for NaN
+            print("Warning: found invalid " + str(position))
+            continue  # Skip the position, and link the previous position to the next valid one
+
+        add_position(position)
+        if len(linked_positions) > 0:
+            previous_position = linked_positions[-1]
+            while previous_position.time_point_number() < position.time_point_number() - 1:
+                # Fill the gap by repeating the previous position
+                previous_position = previous_position.with_time_point_number(previous_position.time_point_number() + 1)
+                linked_positions.append(previous_position)
+        linked_positions.append(position)
+
+    experiment.links.add_track_of_positions(linked_positions)
 
 
 def _fix_python_path_for_pickle():
@@ -1,4 +1,5 @@
 """Some builtin image filters, so that they can be saved and loaded."""
+import math
 from typing import NamedTuple, Dict, Tuple, Optional
 
 import numpy
@@ -20,7 +21,17 @@ class ThresholdFilter(ImageFilter):
         self.noise_limit = noise_limit
 
     def filter(self, time_point, image_z, image: ndarray):
-        image[image < self.noise_limit * image.max()] = 0
+        threshold = self.noise_limit * image.max()
+        if numpy.issubdtype(image.dtype, numpy.integer):
+            threshold = math.ceil(threshold)  # Avoids comparing every pixel as a float
+
+        # For 3D images, we work layer by layer, so that a single small scratch mask can be reused. Multiplying by that
+        # mask (instead of doing image[mask] = 0) keeps everything in fast, in-place NumPy loops
+        layers = image if len(image.shape) == 3 else [image]
+        keep_mask = numpy.empty(image.shape[-2:], dtype=bool)
+        for layer in layers:
+            numpy.greater_equal(layer, threshold, out=keep_mask)
+            numpy.multiply(layer, keep_mask, out=layer)
 
     def copy(self) -> ImageFilter:
         return ThresholdFilter(self.noise_limit)
@@ -69,23 +80,36 @@ class MultiplyPixelsFilter(ImageFilter):
         self.factor = factor
 
     def filter(self, time_point, image_z, image: ndarray):
-        max_value = image.max()
+        if self.factor == 1:
+            return  # Nothing to do, so don't even go over the image
 
         if int(self.factor) == self.factor:
-            # Easy, apply cheap integer multiplication - costs almost no RAM
-
-            # First get rid of things that will overflow
-            new_max = int(max_value / self.factor)
-            image[image > new_max] = new_max
-
-            # Then do integer multiplication
+            # Easy, apply cheap integer multiplication. First get rid of things that will overflow. We use numpy.minimum
+            # with an output array, as that clips in one pass over the image, without allocating a boolean mask like
+            # image[image > new_max] would do
+            if self.factor > 1:
+                new_max = image.max() / self.factor
+                if numpy.issubdtype(image.dtype, numpy.integer):
+                    new_max = int(new_max)
+                numpy.minimum(image, new_max, out=image)
             image *= int(self.factor)
             return
 
-        # Copying required
-        scaled = image * self.factor
-        scaled[scaled > max_value] = max_value  # Prevent overflow
-        image[...] = scaled.astype(numpy.uint8)
+        if self.factor < 1:
+            # Cannot overflow, so multiply in place (for integer images, the result is rounded towards zero)
+            numpy.multiply(image, self.factor, out=image, casting="unsafe")
+            return
+
+        # Clip after multiplying, so that the brightest pixels end up at the old max. (Clipping first at max / factor
+        # would round that limit down for integer images.) We work layer by layer, so that only a single layer needs
+        # to be stored as floats
+        max_value = image.max()
+        layers = image if len(image.shape) == 3 else [image]
+        scaled = numpy.empty(image.shape[-2:], dtype=numpy.float64)
+        for layer in layers:
+            numpy.multiply(layer, self.factor, out=scaled)
+            numpy.minimum(scaled, max_value, out=scaled)
+            layer[...] = scaled  # Rounds towards zero for integer images
 
     def copy(self):
         return MultiplyPixelsFilter(self.factor)
@@ -24,6 +24,11 @@ def load_images(experiment: Experiment, container: str, pattern: str,
         from organoid_tracker.image_loading import merged_tiff_image_loader
         merged_tiff_image_loader.load_from_tif_file(experiment, container, min_time_point, max_time_point)
         return
+    if container.endswith(".zarr") or os.path.isfile(os.path.join(container, ".zarray")):
+        # Zarr arrays are directories, and they don't need to have a name ending in .zarr
+        from organoid_tracker.image_loading import zarr_image_loader
+        zarr_image_loader.load_from_zarr_file(experiment, container, min_time_point, max_time_point)
+        return
     if not os.path.exists(container):
         raise ValueError("File or directory does not exist: " + container)
     if os.path.isdir(container):  # Try as images folder
@@ -0,0 +1,111 @@
+"""Loader for images stored in a Zarr array. The array has the axes (time, channel, z, y, x), and every chunk holds a
+single 2D image. This matches how the visualizer accesses the images (one z-slice at a time), so that showing a slice
+never requires decompressing the rest of the stack."""
+import os
+from typing import Tuple, Optional
+
+import zarr
+from numpy import ndarray
+
+from organoid_tracker.core import TimePoint, max_none, min_none
+from organoid_tracker.core.experiment import Experiment
+from organoid_tracker.core.image_loader import ImageLoader, ImageChannel
+
+
+def load_from_zarr_file(experiment: Experiment, file: str, min_time_point: Optional[int] = None,
+                        max_time_point: Optional[int] = None):
+    """Creates an image loader for the Zarr array stored in the given directory."""
+    image_loader = _ZarrImageLoader(file, min_time_point, max_time_point)
+    experiment.images.image_loader(image_loader)
+
+    # Generate an automatic name for the experiment
+    file_name = os.path.basename(os.path.normpath(file))
+    if file_name.lower().endswith(".zarr"):
+        file_name = file_name[:-5]
+    experiment.name.provide_automatic_name(file_name)
+
+
+def save_as_zarr_file(image_loader: ImageLoader, file: str):
+    """Writes all images of the given image loader to a Zarr array in the given directory, which can then be loaded
+    again using load_from_zarr_file. This is useful to convert image series that are slow to read, like TIFF files
+    that contain an entire time-lapse. Missing images are stored as zeros."""
+    first_time_point_number = image_loader.first_time_point_number()
+    last_time_point_number = image_loader.last_time_point_number()
+    image_size_zyx = image_loader.get_image_size_zyx()
+    if first_time_point_number is None or last_time_point_number is None or image_size_zyx is None:
+        raise ValueError("No images to save")
+    channels = image_loader.get_channels()
+
+    zarr_array = None
+    for time_point_number in range(first_time_point_number, last_time_point_number + 1):
+        for channel in channels:
+            image = image_loader.get_3d_image_array(TimePoint(time_point_number), channel)
+            if image is None:
+                continue
+            if zarr_array is None:
+                # Now that we know the data type, we can create the array
+                zarr_array = zarr.open(file, mode="w", dtype=image.dtype,
+                                       shape=(last_time_point_number - first_time_point_number + 1, len(channels))
+                                             + tuple(image_size_zyx),
+                                       chunks=(1, 1, 1) + tuple(image_size_zyx[1:]))
+                zarr_array.attrs["first_time_point_number"] = first_time_point_number
+            zarr_array[time_point_number - first_time_point_number, channel.index_zero] = image
+    if zarr_array is None:
+        raise ValueError("No images to save")
+
+
+class _ZarrImageLoader(ImageLoader):
+    """Reads images from a 5D Zarr array with the axes TCZYX."""
+
+    _file_name: str
+    _array: zarr.Array
+    _first_time_point_number_in_file: int
+    _min_time_point_number: int
+    _max_time_point_number: int
+
+    def __init__(self, file_name: str, min_time_point_number: Optional[int], max_time_point_number: Optional[int]):
+        self._file_name = file_name
+        self._array = zarr.open(file_name, mode="r")
+        if len(self._array.shape) != 5:
+            raise ValueError(f"Expected an array with the axes TCZYX, but found an array of shape {self._array.shape}")
+
+        self._first_time_point_number_in_file = int(self._array.attrs.get("first_time_point_number", 0))
+        self._min_time_point_number = max_none(self._first_time_point_number_in_file, min_time_point_number)
+        self._max_time_point_number = min_none(self._first_time_point_number_in_file + self._array.shape[0] - 1,
+                                               max_time_point_number)
+
+    def _is_available(self, time_point: TimePoint, image_channel: ImageChannel) -> bool:
+        return self._min_time_point_number <= time_point.time_point_number() <= self._max_time_point_number \
+               and image_channel.index_zero < self._array.shape[1]
+
+    def get_3d_image_array(self, time_point: TimePoint, image_channel: ImageChannel) -> Optional[ndarray]:
+        if not self._is_available(time_point, image_channel):
+            return None
+        return self._array[time_point.time_point_number() - self._first_time_point_number_in_file,
+                           image_channel.index_zero]
+
+    def get_2d_image_array(self, time_point: TimePoint, image_channel: ImageChannel, image_z: int) -> Optional[ndarray]:
+        if not self._is_available(time_point, image_channel):
+            return None
+        if image_z < 0 or image_z >= self._array.shape[2]:
+            return None  # Z out of range
+        return self._array[time_point.time_point_number() - self._first_time_point_number_in_file,
+                           image_channel.index_zero, image_z]
+
+    def get_image_size_zyx(self) -> Optional[Tuple[int, int, int]]:
+        return tuple(self._array.shape[2:])
+
+    def first_time_point_number(self) -> Optional[int]:
+        return self._min_time_point_number
+
+    def last_time_point_number(self) -> Optional[int]:
+        return self._max_time_point_number
+
+    def get_channel_count(self) -> int:
+        return self._array.shape[1]
+
+    def serialize_to_config(self) -> Tuple[str, str]:
+        return self._file_name, ""
+
+    def copy(self) -> "ImageLoader":
+        return _ZarrImageLoader(self._file_name, self._min_time_point_number, self._max_time_point_number)
@@ -40,8 +40,8 @@ SUPPORTED_IMPORT_FILES = [
 def load_positions_and_shapes_from_json(experiment: Experiment, json_file_name: str,
                                         min_time_point: int = 0, max_time_point: int = 5000):
     """Loads a JSON file that contains position positions, with or without shape information."""
-    with open(json_file_name) as handle:
-        time_points = json.load(handle)
+    with open(json_file_name, "rb") as handle:
+        time_points = json.loads(handle.read())
         _parse_shape_format(experiment, time_points, min_time_point, max_time_point)
 
 
@@ -87,8 +87,12 @@ def load_data_file(file_name: str, min_time_point: int = 0, max_time_point: int
 
 def _load_json_data_file(experiment: Experiment, file_name: str, min_time_point: int, max_time_point: int):
     """Loads any kind of JSON file."""
-    with open(file_name) as handle:
-        data = json.load(handle, object_hook=_my_decoder)
+    with open(file_name, "rb") as handle:
+        # The file is read as bytes, so that there is no separate text decoding step: the json module decodes the
+        # (UTF-8) bytes itself, independent of the locale of the system.
+        # No object_hook, so that the JSON parser can stay in C for the entire file. Positions and scores are instead
+        # created by the _parse_... functions, as only those know where in the file positions can be found.
+        data = json.loads(handle.read())
 
         if "version" not in data and "family_scores" not in data:
             # We don't have a general data file, but a specialized one
@@ -130,7 +134,8 @@ def _load_json_data_file(experiment: Experiment, file_name: str, min_time_point:
             _parse_connections_format(experiment, data["connections"], min_time_point, max_time_point)
 
         if "family_scores" in data:
-            experiment.scores.add_scored_families(data["family_scores"])
+            experiment.scores.add_scored_families(_decode_scored_family(scored_family_json)
+                                                  for scored_family_json in data["family_scores"])
 
         if "warning_limits" in data:
             experiment.warning_limits = WarningLimits(**data["warning_limits"])
@@ -150,7 +155,8 @@ def _load_json_data_file(experiment: Experiment, file_name: str, min_time_point:
             experiment.images.set_resolution(ImageResolution(x_res, y_res, z_res, t_res))
 
         if "image_offsets" in data:
-            experiment.images.offsets = ImageOffsets(data["image_offsets"])
+            experiment.images.offsets = ImageOffsets([_decode_position(offset_json)
+                                                      for offset_json in data["image_offsets"]])
 
         if "image_filters" in data:
             experiment.images.filters = _parse_image_filters(data["image_filters"])
@@ -164,7 +170,7 @@ def _load_json_data_file(experiment: Experiment, file_name: str, min_time_point:
 
 
 def _parse_shape_format(experiment: Experiment, json_structure: Dict[str, List], min_time_point: int, max_time_point: int):
-    positions = experiment.positions
+    add_position = experiment.positions.add  # Looked up once, as it is called for every position in the file
     position_data = experiment.position_data
 
     for time_point_number, raw_positions in json_structure.items():
@@ -173,11 +179,12 @@ def _parse_shape_format(experiment: Experiment, json_structure: Dict[str, List],
             continue
 
         for raw_position in raw_positions:
-            position = Position(*raw_position[0:3], time_point_number=time_point_number)
-            position_shape = shape.from_list(raw_position[3:])
-            positions.add(position)
-            if not position_shape.is_unknown():
-                linking_markers.set_shape(position_data, position, position_shape)
+            position = Position(raw_position[0], raw_position[1], raw_position[2], time_point_number=time_point_number)
+            add_position(position)
+            if len(raw_position) > 3:  # Most positions are just [x, y, z], so only then we need to look for a shape
+                position_shape = shape.from_list(raw_position[3:])
+                if not position_shape.is_unknown():
+                    linking_markers.set_shape(position_data, position, position_shape)
 
 
 def _parse_links_format(experiment: Experiment, links_json: Dict[str, Any], min_time_point: int, max_time_point: int):
@@ -186,9 +193,9 @@ def _parse_links_format(experiment: Experiment, links_json: Dict[str, Any], min_
     position_data = experiment.position_data
     link_data = experiment.link_data
     _add_d3_data(links, link_data, position_data, links_json, min_time_point, max_time_point)
-    positions = experiment.positions
+    add_position = experiment.positions.add
     for position in links.find_all_positions():
-        positions.add(position)
+        add_position(position)
 
 
 def _parse_splines_format(experiment: Experiment, splines_data: List[Dict], min_time_point: int, max_time_point: int):
@@ -237,7 +244,7 @@ def _parse_beacons_format(experiment: Experiment, beacons_data: Dict[str, List],
             experiment.beacons.add(Position(*beacon_values, time_point_number=time_point_number))
 
 
-def _parse_connections_format(experiment: Experiment, connections_data: Dict[str, List[List[Position]]],
+def _parse_connections_format(experiment: Experiment, connections_data: Dict[str, List[List[Dict[str, float]]]],
                               min_time_point: int, max_time_point: int):
     """Adds all connections from the serialized format to the Connections object."""
     connections = experiment.connections
@@ -250,8 +257,10 @@ def _parse_connections_format(experiment: Experiment, connections_data: Dict[str
             position1 = connection[0]
             position2 = connection[1]
 
-            connections.add_connection(position1.with_time_point_number(time_point_number),
-                                       position2.with_time_point_number(time_point_number))
+            connections.add_connection(Position(position1["x"], position1["y"], position1["z"],
+                                                time_point_number=time_point_number),
+                                       Position(position2["x"], position2["y"], position2["z"],
+                                                time_point_number=time_point_number))
 
 
 def _parse_image_filters(data: Dict[str, Any]) -> ImageFilters:
@@ -283,10 +292,13 @@ def _add_d3_data(links: Links, link_data: LinkData, position_data: PositionData,
 
     # Add position data
     for node in links_json["nodes"]:
-        if len(node.keys()) == 1:
+        if len(node) == 1:
             # No extra data found
             continue
-        position = node["id"]
+        position_json = node["id"]
+        if not min_time_point <= position_json["_time_point_number"] <= max_time_point:
+            continue  # Ignore time points out of range
+        position = _decode_position(position_json)
         for data_key, data_value in node.items():
             if data_key == "id":
                 continue
@@ -294,13 +306,22 @@ def _add_d3_data(links: Links, link_data: LinkData, position_data: PositionData,
             position_data.set_position_data(position, data_key, data_value)
 
     # Add links (and link and lineage data)
+    add_link = links.add_link  # Looked up once, as it is called for every link in the file
     for link in links_json["links"]:
-        source: Position = link["source"]
-        target: Position = link["target"]
-        if source.time_point_number() < min_time_point or target.time_point_number() < min_time_point \
-            or source.time_point_number() > max_time_point or target.time_point_number() > max_time_point:
-            continue  # Ignore time points out of range
-        links.add_link(source, target)
+        source_json = link["source"]
+        target_json = link["target"]
+        source_time_point_number = source_json["_time_point_number"]
+        target_time_point_number = target_json["_time_point_number"]
+        if not min_time_point <= source_time_point_number <= max_time_point \
+                or not min_time_point <= target_time_point_number <= max_time_point:
+            continue  # Ignore time points out of range, without creating Position objects for them
+        source = Position(source_json["x"], source_json["y"], source_json["z"],
+                          time_point_number=source_time_point_number)
+        target = Position(target_json["x"], target_json["y"], target_json["z"],
+                          time_point_number=target_time_point_number)
+        add_link(source, target)
+        if len(link) == 2:
+            continue  # Only "source" and "target", so no extra data found
 
         # Now that we have a link, we can add link and lineage data
         for data_key, data_value in link.items():
@@ -312,50 +333,57 @@ def _add_d3_data(links: Links, link_data: LinkData, position_data: PositionData,
                 link_data.set_link_data(source, target, data_key, data_value)
 
 
+def _encode_position(o: Position) -> Dict[str, Any]:
+    if o.time_point_number() is None:
+        return {"x": o.x, "y": o.y, "z": o.z}
+    return {"x": o.x, "y": o.y, "z": o.z, "_time_point_number": o.time_point_number()}
+
+
+def _encode_scored_family(o: ScoredFamily) -> Dict[str, Any]:
+    daughters = list(o.family.daughters)
+    return {
+        "scores": o.score.dict(),
+        "mother": _encode_position(o.family.mother),
+        "daughter1": _encode_position(daughters[0]),
+        "daughter2": _encode_position(daughters[1])
+    }
+
+
+# Encoders by exact type, so that _MyEncoder needs just one dictionary lookup per object
+_ENCODERS_BY_TYPE = {
+    Position: _encode_position,
+    Score: lambda o: {"scores": o.dict()},
+    ScoredFamily: _encode_scored_family,
+    numpy.int32: int
+}
+
+
 class _MyEncoder(JSONEncoder):
     def default(self, o):
-        if isinstance(o, Position):
-            if o.time_point_number() is None:
-                return {"x": o.x, "y": o.y, "z": o.z}
-            return {"x": o.x, "y": o.y, "z": o.z, "_time_point_number": o.time_point_number()}
-        if isinstance(o, Score):
-            return o.__dict__
-
-        if isinstance(o, ScoredFamily):
-            daughters = list(o.family.daughters)
-            return {
-                "scores": o.score.dict(),
-                "mother": o.family.mother,
-                "daughter1": daughters[0],
-                "daughter2": daughters[1]
-            }
-
-        if isinstance(o, numpy.int32):
-            return numpy.asscalar(o)
-
+        encoder = _ENCODERS_BY_TYPE.get(type(o))
+        if encoder is not None:
+            return encoder(o)
         return JSONEncoder.default(self, o)
 
 
-def _my_decoder(json_object):
-    if 'x' in json_object and 'y' in json_object and 'z' in json_object:
-        if '_time_point_number' in json_object:
-            return Position(json_object['x'], json_object['y'], json_object['z'],
-                            time_point_number=json_object['_time_point_number'])
-        else:
-            return Position(json_object['x'], json_object['y'], json_object['z'])
-    if 'scores' in json_object and 'mother' in json_object and 'daughter1' in json_object:
-        mother = json_object["mother"]
-        daughter1 = json_object["daughter1"]
-        daughter2 = json_object["daughter2"]
-        family = Family(mother, daughter1, daughter2)
-        score = Score(**json_object["scores"])
-        return ScoredFamily(family, score)
-    return json_object
+def _decode_position(json_object: Dict[str, Any]) -> Position:
+    """Decodes a position that was encoded by _MyEncoder."""
+    return Position(json_object["x"], json_object["y"], json_object["z"],
+                    time_point_number=json_object.get("_time_point_number"))
+
+
+def _decode_scored_family(json_object: Dict[str, Any]) -> ScoredFamily:
+    """Decodes a scored family that was encoded by _MyEncoder."""
+    family = Family(_decode_position(json_object["mother"]), _decode_position(json_object["daughter1"]),
+                    _decode_position(json_object["daughter2"]))
+    score = Score(**json_object["scores"])
+    return ScoredFamily(family, score)
 
 
 def _links_to_d3_data(links: Links, positions: Iterable[Position], position_data: PositionData, link_data: LinkData) -> Dict:
     """Return data in D3.js node-link format that is suitable for JSON serialization
-    and use in Javascript documents."""
+    and use in Javascript documents. Positions are already converted to dictionaries here, so that the JSON encoder
+    doesn't need to call back to _MyEncoder for every node and link."""
     links.sort_tracks_by_x()  # Make sure tracks are always saved in the correct order
 
     nodes = list()
@@ -363,7 +391,7 @@ def _links_to_d3_data(links: Links, positions: Iterable[Position], position_data
     # Save nodes and store extra data
     for position in positions:
         node = {
-            "id": position
+            "id": _encode_position(position)
         }
         for data_name, data_value in position_data.find_all_data_of_position(position):
             if data_name == "shape":
@@ -376,8 +404,8 @@ def _links_to_d3_data(links: Links, positions: Iterable[Position], position_data
     edges = list()
     for source, target in links.find_all_links():
         edge = {
-            "source": source,
-            "target": target
+            "source": _encode_position(source),
+            "target": _encode_position(target)
         }
         if source in lineage_starting_positions:
             # Start of a lineage, so add lineage data
@@ -408,7 +436,8 @@ def save_positions_to_json(experiment: Experiment, json_file_name: str):
     if os.path.exists(json_file_name):
         os.rename(json_file_name, json_file_name_old)
     with open(json_file_name, 'w') as handle:
-        json.dump(data_structure, handle, cls=_MyEncoder)
+        # json.dumps can use the C encoder, unlike json.dump, which always encodes in Python
+        handle.write(json.dumps(data_structure, cls=_MyEncoder))
     if os.path.exists(json_file_name_old):
         os.remove(json_file_name_old)
 
@@ -442,15 +471,16 @@ def _encode_beacons(beacons: BeaconCollection):
 
 
 def _encode_positions_and_shapes(positions: PositionCollection, shapes: PositionData):
-    data_structure = {}
-    for time_point in positions.time_points():
-        encoded_positions = []
-        for position in positions.of_time_point(time_point):
-            shape = linking_markers.get_shape(shapes, position)
-            encoded_positions.append([position.x, position.y, position.z] + shape.to_list())
-
-        data_structure[str(time_point.time_point_number())] = encoded_positions
-    return data_structure
+    # Shapes don't have a fixed number of parameters, so they cannot be converted to one big NumPy array. However, if
+    # there are no shapes at all, we can skip looking them up, and directly store [x, y, z] for every position
+    if linking_markers.has_shapes(shapes):
+        return {str(time_point.time_point_number()): [[position.x, position.y, position.z,
+                                                       *linking_markers.get_shape(shapes, position).to_list()]
+                                                      for position in positions.of_time_point(time_point)]
+                for time_point in positions.time_points()}
+    return {str(time_point.time_point_number()): [[position.x, position.y, position.z]
+                                                  for position in positions.of_time_point(time_point)]
+            for time_point in positions.time_points()}
 
 
 def _encode_data_axes_to_json(data_axes: SplineCollection) -> List[Dict]:
@@ -543,9 +573,9 @@ def save_data_to_json(experiment: Experiment, json_file_name: str):
                                                experiment.link_data)
 
     # Save scores of families
-    scored_families = list(experiment.scores.all_scored_families())
-    if len(scored_families) > 0:
-        save_data["family_scores"] = scored_families
+    if experiment.scores.has_family_scores():
+        save_data["family_scores"] = [_encode_scored_family(scored_family)
+                                      for scored_family in experiment.scores.all_scored_families()]
 
     # Save data axes
     if experiment.splines.has_splines():
@@ -593,7 +623,8 @@ def save_data_to_json(experiment: Experiment, json_file_name: str):
     if os.path.exists(json_file_name):
         os.rename(json_file_name, json_file_name_old)
     with open(json_file_name, 'w') as handle:
-        json.dump(save_data, handle, cls=_MyEncoder)
+        # json.dumps can use the C encoder, unlike json.dump, which always encodes in Python
+        handle.write(json.dumps(save_data, cls=_MyEncoder))
     if os.path.exists(json_file_name_old):
         os.remove(json_file_name_old)
 
@@ -1,52 +1,31 @@
 """Contains function that allows you to find the nearest few positions"""
 
-import operator
-from typing import Iterable, List, Optional, Set, Dict
+from typing import Iterable, List, Optional, Set
+
+import numpy
+from numpy import ndarray
 
 from organoid_tracker.core.position import Position
 from organoid_tracker.core.resolution import ImageResolution
 
 
-class _NearestPositions:
-    """Internal class for bookkeeping of what the nearest few positions are"""
-
-    _tolerance_squared: float
-    _all_distances: Dict[Position, float]
-    _shortest_distance_squared: float
-    _max_distance_squared_um2: float  # Used to set a maximum distance above which we don't even need to look anymore
-
-    def __init__(self, tolerance: float, max_distance_um: float):
-        self._tolerance_squared = tolerance ** 2
-        self._max_distance_squared_um2 = max_distance_um ** 2
-        self._all_distances = {}
-        self._shortest_distance_squared = float("inf")
-
-    def add_candidate(self, new_position: Position, distance_squared: float) -> None:
-        if distance_squared > self._max_distance_squared_um2:
-            return  # Too far according to global limit
-        if distance_squared > self._tolerance_squared * self._shortest_distance_squared:
-            return  # Position is too far away compared to nearest
-
-        if distance_squared < self._shortest_distance_squared:
-            # New shortest distance
-            self._shortest_distance_squared = distance_squared
-
-        self._all_distances[new_position] = distance_squared
-
-    def get_positions(self, max_amount: int) -> List[Position]:
-        """Gets the found positions."""
-        max_allowed_distance_squared = self._shortest_distance_squared * self._tolerance_squared
-        return_list = []
-        for position, distance_squared in self._all_distances.items():
-            if distance_squared <= max_allowed_distance_squared:
-                return_list.append(position)
-        if len(return_list) > max_amount:
-            # Need to return only the closest
-            def get_distance_squared(pos: Position):
-                return self._all_distances[pos]
-            return_list.sort(key=get_distance_squared)
-            return return_list[0:max_amount]
-        return return_list
+def _distances_squared_um2(positions: List[Position], around: Position, resolution: ImageResolution,
+                           *, ignore_z: bool = False) -> ndarray:
+    """Calculates position.distance_squared(around, resolution) for all given positions at once. This is a lot faster
+    than calculating the distances one by one, as these functions are often called for all positions in a time
+    point."""
+    count = len(positions)
+    pixel_size_z_um, pixel_size_y_um, pixel_size_x_um = resolution.pixel_size_zyx_um
+    dx = (numpy.fromiter((position.x for position in positions), dtype=numpy.float64, count=count) - around.x) \
+        * pixel_size_x_um
+    dy = (numpy.fromiter((position.y for position in positions), dtype=numpy.float64, count=count) - around.y) \
+        * pixel_size_y_um
+    distances_squared = dx ** 2 + dy ** 2
+    if not ignore_z:
+        dz = (numpy.fromiter((position.z for position in positions), dtype=numpy.float64, count=count) - around.z) \
+            * pixel_size_z_um
+        distances_squared += dz ** 2
+    return distances_squared
 
 
 def find_close_positions(positions: Iterable[Position], *, around: Position, tolerance: float, resolution: ImageResolution,
@@ -60,59 +39,88 @@ def find_close_positions(positions: Iterable[Position], *, around: Position, tol
     - max_amount if the maximum amount of returned positions. If there are more positions within the tolerance, then
       only the nearest positions are returned.
 
-    Returns a list of the nearest positions, ordered from closest to furthest
+    Returns a list of the nearest positions, ordered from closest to furthest. If a position is given multiple times,
+    it is returned only once.
     """
     if tolerance < 1:
         raise ValueError()
-    nearest_positions = _NearestPositions(tolerance, max_distance_um)
-    for position in positions:
-        nearest_positions.add_candidate(position, position.distance_squared(around, resolution))
-    return nearest_positions.get_positions(max_amount)
+    positions = list(dict.fromkeys(positions))  # Removes duplicates, while keeping the order
+    if len(positions) == 0:
+        return []
+    distances_squared = _distances_squared_um2(positions, around, resolution)
+
+    # Only keep the positions within the tolerance of the nearest position
+    max_allowed_distance_squared = min(distances_squared.min() * tolerance ** 2, max_distance_um ** 2)
+    indices = numpy.nonzero(distances_squared <= max_allowed_distance_squared)[0]
+    if len(indices) > max_amount:
+        # Need to return only the closest
+        indices = indices[numpy.argsort(distances_squared[indices], kind="stable")[0:max_amount]]
+    return [positions[index] for index in indices]
 
 
 def find_closest_position(positions: Iterable[Position], *, around: Position, resolution: ImageResolution,
                           ignore_z: bool = False, max_distance_um: int = 100000) -> Optional[Position]:
     """Gets the position closest ot the given position."""
-    closest_position = None
-    closest_distance_squared = max_distance_um ** 2
-
-    for position in positions:
-        if ignore_z:
-            around.z = position.z  # Make search ignore z
-        distance = position.distance_squared(around, resolution)
+    positions = list(positions)
+    if len(positions) == 0:
+        return None
+    distances_squared = _distances_squared_um2(positions, around, resolution, ignore_z=ignore_z)
 
-        around_time_point_number = around.time_point_number()
-        if around_time_point_number is not None:  # Make positions in same time point closer
-            distance += (around_time_point_number - position.time_point_number()) ** 2
+    around_time_point_number = around.time_point_number()
+    if around_time_point_number is not None:  # Make positions in same time point closer
+        distances_squared += (numpy.fromiter((position.time_point_number() for position in positions),
+                                             dtype=numpy.float64, count=len(positions)) - around_time_point_number) ** 2
 
-        if distance < closest_distance_squared:
-            closest_distance_squared = distance
-            closest_position = position
-
-    return closest_position
+    closest_index = int(distances_squared.argmin())
+    if distances_squared[closest_index] >= max_distance_um ** 2:
+        return None
+    return positions[closest_index]
 
 
 def find_closest_n_positions(positions: Iterable[Position], *, around: Position, max_amount: int,
                              resolution: ImageResolution, max_distance_um: float = 100000, ignore_self: bool = True
                              ) -> Set[Position]:
-    max_distance_squared = max_distance_um ** 2
-    closest_positions = []
+    positions = list(positions)
+    if len(positions) == 0:
+        return set()
+    distances_squared = _distances_squared_um2(positions, around, resolution)
+
+    indices = numpy.nonzero(distances_squared <= max_distance_um ** 2)[0]
+
+    # We only need to sort the closest positions (plus one, in case we find around itself). Using a partition, we find
+    # the distance of the furthest of those. Everything at that same distance is kept as well, so that ties are broken
+    # in the same way as a full sort would do
+    needed_count = max_amount + 1 if ignore_self else max_amount
+    if 0 < needed_count < len(indices):
+        max_distance_squared = numpy.partition(distances_squared[indices], needed_count - 1)[needed_count - 1]
+        closest_indices = indices[distances_squared[indices] <= max_distance_squared]
+        return_value = _take_closest(positions, closest_indices, distances_squared, around=around,
+                                     max_amount=max_amount, ignore_self=ignore_self)
+        if return_value is not None:
+            return return_value
+        # Happens if multiple positions are equal to around, just try again with all positions
+
+    return _take_closest(positions, indices, distances_squared, around=around, max_amount=max_amount,
+                         ignore_self=ignore_self, allow_fewer=True)
+
+
+def _take_closest(positions: List[Position], indices: ndarray, distances_squared: ndarray, *, around: Position,
+                  max_amount: int, ignore_self: bool, allow_fewer: bool = False) -> Optional[Set[Position]]:
+    """Returns the max_amount closest positions of the given indices. If there are fewer than that (after skipping
+    around itself) then None is returned, unless allow_fewer is True."""
+    indices = indices[numpy.argsort(distances_squared[indices], kind="stable")]
 
-    for position in positions:
+    return_value = set()
+    found_count = 0
+    for index in indices:
+        if found_count >= max_amount:
+            break
+        position = positions[index]
         if ignore_self and position == around:
             continue
-        distance_squared = position.distance_squared(around, resolution)
-        if distance_squared > max_distance_squared:
-            continue
-        if len(closest_positions) < max_amount or closest_positions[-1][0] > distance_squared:
-            # Found closer position
-            closest_positions.append((distance_squared, position))
-            closest_positions.sort(key=operator.itemgetter(0))
-            if len(closest_positions) > max_amount:
-                # List too long, remove furthest
-                del closest_positions[-1]
-
-    return_value = set()
-    for distance_squared, position in closest_positions:
         return_value.add(position)
+        found_count += 1
+
+    if found_count < max_amount and not allow_fewer:
+        return None
     return return_value
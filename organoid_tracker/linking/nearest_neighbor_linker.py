@@ -1,10 +1,49 @@
 """Ultra-simple linker. Used as a starting point for more complex links."""
+from typing import Iterable, List
+
+import numpy
+from scipy.spatial import cKDTree
+
 from organoid_tracker.core import TimePoint
 from organoid_tracker.core.experiment import Experiment
 from organoid_tracker.core.images import Images
 from organoid_tracker.core.links import Links
+from organoid_tracker.core.position import Position
 from organoid_tracker.core.position_collection import PositionCollection
-from organoid_tracker.linking.nearby_position_finder import find_close_positions
+from organoid_tracker.core.resolution import ImageResolution
+
+
+class _PositionTree:
+    """KD-tree of all positions in a time point. Every position in the current time point needs to find its nearby
+    positions in the previous/next time point, and this makes each of those searches O(log n) instead of O(n)."""
+
+    _positions: List[Position]
+    _pixel_size_xyz_um: numpy.ndarray
+    _tree: cKDTree
+
+    def __init__(self, positions: Iterable[Position], resolution: ImageResolution):
+        self._positions = list(positions)
+        self._pixel_size_xyz_um = numpy.array(resolution.pixel_size_zyx_um[::-1], dtype=numpy.float64)
+        coords_um = numpy.array([(position.x, position.y, position.z) for position in self._positions],
+                                dtype=numpy.float64).reshape(-1, 3) * self._pixel_size_xyz_um
+        self._tree = cKDTree(coords_um)
+
+    def find_close_positions(self, around: Position, *, tolerance: float, max_amount: int) -> List[Position]:
+        """Same as nearby_position_finder.find_close_positions, but uses the tree. Returns the positions ordered from
+        closest to furthest."""
+        if tolerance < 1:
+            raise ValueError()
+        if len(self._positions) == 0:
+            return []
+        around_um = numpy.array([around.x, around.y, around.z], dtype=numpy.float64) * self._pixel_size_xyz_um
+        distances, indices = self._tree.query(around_um, k=min(max_amount, len(self._positions)))
+        distances = numpy.atleast_1d(distances)
+        indices = numpy.atleast_1d(indices)
+
+        # Only keep the positions within the tolerance of the nearest position
+        max_allowed_distance = distances[0] * tolerance
+        return [self._positions[index] for index, distance in zip(indices, distances)
+                if distance <= max_allowed_distance]
 
 
 def nearest_neighbor(experiment: Experiment, *, tolerance: float = 1.0, back: bool = True, forward: bool = True
@@ -48,7 +87,7 @@ def nearest_neighbor(experiment: Experiment, *, tolerance: float = 1.0, back: bo
 def _add_nearest_edges(links: Links, positions: PositionCollection, images: Images, time_point_previous: TimePoint,
                        time_point_current: TimePoint, tolerance: float):
     """Adds edges pointing towards previous time point, making the shortest one the preferred."""
-    resolution = images.resolution()
+    previous_positions = _PositionTree(positions.of_time_point(time_point_previous), images.resolution())
     for position in positions.of_time_point(time_point_current):
         # Check if position was inside the image in the previous time point
         previous_position = position.with_time_point(time_point_previous)
@@ -57,15 +96,14 @@ def _add_nearest_edges(links: Links, positions: PositionCollection, images: Imag
             continue  # Skip, position will go out of view
 
         # If yes, make links to previous time point
-        nearby_list = find_close_positions(positions.of_time_point(time_point_previous), around=position,
-                                           tolerance=tolerance, max_amount=5, resolution=resolution)
+        nearby_list = previous_positions.find_close_positions(position, tolerance=tolerance, max_amount=5)
         for nearby_position in nearby_list:
             links.add_link(position, nearby_position)
 
 
 def _add_nearest_edges_extra(links: Links, positions: PositionCollection, images: Images, time_point_current: TimePoint, time_point_next: TimePoint, tolerance: float):
     """Adds edges to the next time point, which is useful if _add_edges missed some possible links."""
-    resolution = images.resolution()
+    next_positions = _PositionTree(positions.of_time_point(time_point_next), images.resolution())
     for position in positions.of_time_point(time_point_current):
         # Check if position is still inside the image in the next time point
         next_position = position.with_time_point(time_point_next)
@@ -74,7 +112,6 @@ def _add_nearest_edges_extra(links: Links, positions: PositionCollection, images
             continue  # Skip, position will go out of view
 
         # If yes, make links to next time point
-        nearby_list = find_close_positions(positions.of_time_point(time_point_next), around=position,
-                                           tolerance=tolerance, max_amount=5, resolution=resolution)
+        nearby_list = next_positions.find_close_positions(position, tolerance=tolerance, max_amount=5)
         for nearby_position in nearby_list:
             links.add_link(position, nearby_position)
@@ -24,13 +24,17 @@ class Error(Enum):
     UNCERTAIN_POSITION = 13
     LOW_LINK_SCORE = 14
 
+    # Set below, for all errors
+    _severity: Severity
+    _message: str
+
     def get_severity(self) -> Severity:
         """Gets the severity."""
-        return _get_severity(self)
+        return self._severity
 
     def get_message(self) -> str:
         """Gets an user-friendly error message."""
-        return _get_message(self)
+        return self._message
 
 
 __info = {
@@ -53,17 +57,7 @@ __info = {
 }
 
 
-def _get_severity(error: Error) -> Severity:
-    """Gets the severity of the given error."""
-    try:
-        return __info[error][0]
-    except KeyError:
-        return Severity.ERROR
-
-
-def _get_message(error: Error) -> str:
-    """Gets the error message corresponding to the given error."""
-    try:
-        return __info[error][1]
-    except KeyError:
-        return "Unknown error code " + str(error)
+# Store the info on the errors themselves, so that looking up the severity or message is just an attribute read
+for _error in Error:
+    _error._severity, _error._message = __info.get(_error, (Severity.ERROR, "Unknown error code " + str(_error)))
+del _error
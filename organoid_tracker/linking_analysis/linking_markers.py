@@ -61,49 +61,37 @@ def set_track_end_marker(position_data: PositionData, position: Position, end_ma
 
 def find_death_and_shed_positions(links: Links, position_data: PositionData) -> Iterable[Position]:
     """Gets all positions that were marked as a cell death or a cell shedding event."""
-    death_marker = EndMarker.DEAD.name.lower()
-    shed_marker = EndMarker.SHED.name.lower()
-    shed_outside_marker = EndMarker.SHED_OUTSIDE.name.lower()
-    stimulated_shed_marker = EndMarker.STIMULATED_SHED.name.lower()
-    for position, ending_marker in position_data.find_all_positions_with_data("ending"):
-        if len(links.find_futures(position)) > 0:
-            continue  # Not actually ending, ending marker is useless
-
-        if ending_marker == death_marker or ending_marker == shed_marker or ending_marker == shed_outside_marker or ending_marker == stimulated_shed_marker:
-            yield position
+    return _find_ending_positions(links, position_data, {EndMarker.DEAD, EndMarker.SHED, EndMarker.SHED_OUTSIDE,
+                                                         EndMarker.STIMULATED_SHED})
 
 
 def find_shed_positions(links: Links, position_data: PositionData) -> Iterable[Position]:
     """Gets all positions that were marked as a cell shedding event."""
-    shed_marker = EndMarker.SHED.name.lower()
-    shed_outside_marker = EndMarker.SHED_OUTSIDE.name.lower()
-    for position, ending_marker in position_data.find_all_positions_with_data("ending"):
-        if len(links.find_futures(position)) > 0:
-            continue  # Not actually ending, ending marker is useless
-
-        if ending_marker == shed_marker or ending_marker == shed_outside_marker:
-            yield position
+    return _find_ending_positions(links, position_data, {EndMarker.SHED, EndMarker.SHED_OUTSIDE})
 
 
 def find_death_positions(links: Links, position_data: PositionData) -> Iterable[Position]:
     """Gets all positions that were marked as a cell death event."""
-    dead_marker = EndMarker.DEAD.name.lower()
-    for position, ending_marker in position_data.find_all_positions_with_data("ending"):
-        if len(links.find_futures(position)) > 0:
-            continue  # Not actually ending, ending marker is useless
+    return _find_ending_positions(links, position_data, {EndMarker.DEAD})
 
-        if ending_marker == dead_marker:
-            yield position
 
 def find_stimulated_shed_positions(links: Links, position_data: PositionData) -> Iterable[Position]:
-    """Gets all positions that were marked as a cell death event."""
-    stimulated_shed_marker = EndMarker.STIMULATED_SHED.name.lower()
+    """Gets all positions that were marked as a stimulated cell shedding event."""
+    return _find_ending_positions(links, position_data, {EndMarker.STIMULATED_SHED})
+
+
+def _find_ending_positions(links: Links, position_data: PositionData, end_markers: Set[EndMarker]
+                           ) -> Iterable[Position]:
+    """Gets all positions that have one of the given end markers, and that don't have any links to the future."""
+    end_marker_strs = {end_marker.name.lower() for end_marker in end_markers}
     for position, ending_marker in position_data.find_all_positions_with_data("ending"):
+        if ending_marker not in end_marker_strs:
+            continue  # Checked first, as this is a lot cheaper than looking up the links
+
         if len(links.find_futures(position)) > 0:
             continue  # Not actually ending, ending marker is useless
 
-        if ending_marker == stimulated_shed_marker:
-            yield position
+        yield position
 
 
 def get_track_start_marker(position_data: PositionData, position: Position) -> Optional[StartMarker]:
@@ -129,15 +117,26 @@ def find_errored_positions(position_data: PositionData, *, min_time_point: Optio
     min_time_point_number = min_time_point.time_point_number() if min_time_point is not None else float("-inf")
     max_time_point_number = max_time_point.time_point_number() if max_time_point is not None else float("inf")
 
+    suppressed_errors = dict(position_data.find_all_positions_with_data("suppressed_error"))
     with_error_marker = position_data.find_all_positions_with_data("error")
     for position, error_number in with_error_marker:
-        if position_data.get_position_data(position, "suppressed_error") == error_number:
+        if suppressed_errors.get(position) == error_number:
             continue  # Error was suppressed
 
         if min_time_point_number <= position.time_point_number() <= max_time_point_number:
             yield position
 
 
+def count_errored_positions(position_data: PositionData) -> int:
+    """Counts all positions that have a (non suppressed) error. Faster than counting the results of
+    find_errored_positions, as the positions themselves are never yielded."""
+    suppressed_errors = dict(position_data.find_all_positions_with_data("suppressed_error"))
+    with_error_marker = position_data.find_all_positions_with_data("error")
+    if len(suppressed_errors) == 0:
+        return len(with_error_marker)
+    return sum(suppressed_errors.get(position) != error_number for position, error_number in with_error_marker)
+
+
 def get_error_marker(position_data: PositionData, position: Position) -> Optional[Error]:
     """Gets the error marker for the given link, if any. Returns None if the error has been suppressed using
     suppress_error_marker."""
@@ -1,9 +1,7 @@
-import random
+import functools
 from typing import Tuple, List, Iterable, Optional
 
 import mahotas
-import matplotlib.cm
-import matplotlib.colors
 import numpy
 from numpy import ndarray
 from scipy.ndimage import morphology
@@ -11,22 +9,34 @@ from scipy.ndimage import morphology
 from organoid_tracker.core.position import Position
 
 
-def _create_colormap() -> List[Tuple[float, float, float, float]]:
-    many_colors = []
-    many_colors += map(matplotlib.cm.get_cmap("prism"), range(256))
-    many_colors += map(matplotlib.cm.get_cmap("cool"), range(256))
-    many_colors += map(matplotlib.cm.get_cmap("summer"), range(256))
-    many_colors += map(matplotlib.cm.get_cmap("spring"), range(256))
-    many_colors += map(matplotlib.cm.get_cmap("autumn"), range(256))
-    many_colors += map(matplotlib.cm.get_cmap("PiYG"), range(256))
-    many_colors += map(matplotlib.cm.get_cmap("Spectral"), range(256))
-    random.shuffle(many_colors)
+@functools.lru_cache(maxsize=1)
+def _get_color_array() -> ndarray:
+    """Many random colors, useful for showing label images. Index 0 (the background) is black. Only created on the
+    first call."""
+    import matplotlib.cm
+
+    many_colors = numpy.concatenate([matplotlib.cm.get_cmap(name)(numpy.arange(256))
+                                     for name in ("prism", "cool", "summer", "spring", "autumn", "PiYG", "Spectral")])
+    numpy.random.default_rng(0).shuffle(many_colors)  # Fixed seed, and leaves the global random state alone
     many_colors[0] = (0., 0., 0., 1.)  # We want a black background
     return many_colors
 
 
-COLOR_ARRAY = _create_colormap()
-COLOR_MAP = matplotlib.colors.ListedColormap(COLOR_ARRAY, name="random", N=2000)
+@functools.lru_cache(maxsize=1)
+def _get_color_map() -> "matplotlib.colors.Colormap":
+    """Colormap of the colors of _get_color_array()."""
+    import matplotlib.colors
+    return matplotlib.colors.ListedColormap(_get_color_array(), name="random", N=2000)
+
+
+def __getattr__(name: str):
+    # COLOR_ARRAY and COLOR_MAP used to be module constants. They're now only created when they're first used, as
+    # creating them requires importing matplotlib
+    if name == "COLOR_ARRAY":
+        return _get_color_array()
+    if name == "COLOR_MAP":
+        return _get_color_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def distance_transform_to_labels(labels: ndarray, resolution: Tuple[float, float, float]):
@@ -67,21 +77,24 @@ def create_labels(positions: List[Optional[Position]], output: ndarray):
     if positions[0] is not None:
         raise ValueError("First position (index 0) must be None, as that will be the background of the image.")
 
-    i = 0
-    for image_position in positions:
-        if image_position is None:
-            i += 1
-            continue
-
-        try:
-            z = int(image_position.z)
-            if z == -1 or z == output.shape[0]:
-                z = max(0, min(z, output.shape[0] - 1))  # Clamp z when position is just above or below expected range
-            output[z, int(image_position.y), int(image_position.x)] = i
-            i += 1
-        except IndexError:
-            raise ValueError(f"The images do not match the cells: {position} is outside the image of size "
-                             f"{(output.shape[2], output.shape[1], output.shape[0])}")
+    # The label of a position is its index in the list
+    labels = numpy.array([i for i, position in enumerate(positions) if position is not None], dtype=numpy.intp)
+    labelled_positions = [positions[label] for label in labels]
+    count = len(labels)
+    x = numpy.fromiter((position.x for position in labelled_positions), dtype=numpy.float64, count=count)
+    y = numpy.fromiter((position.y for position in labelled_positions), dtype=numpy.float64, count=count)
+    z = numpy.fromiter((position.z for position in labelled_positions), dtype=numpy.float64, count=count)
+    x, y, z = x.astype(numpy.intp), y.astype(numpy.intp), z.astype(numpy.intp)  # Rounds towards zero, like int(..)
+
+    # Clamp z when position is just above or below expected range
+    z[z == -1] = 0
+    z[z == output.shape[0]] = output.shape[0] - 1
+
+    try:
+        output[z, y, x] = labels
+    except IndexError:
+        raise ValueError(f"The images do not match the cells: some positions are outside the image of size "
+                         f"{(output.shape[2], output.shape[1], output.shape[0])}")
 
 
 def watershed_labels(threshold: ndarray, surface: ndarray, label_image: ndarray, label_count: int) -> Tuple[ndarray, ndarray]:
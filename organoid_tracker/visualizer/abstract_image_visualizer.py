@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Tuple
 
 import cv2
 import numpy
@@ -6,6 +7,7 @@ from matplotlib import cm
 from matplotlib.backend_bases import MouseEvent
 from matplotlib.collections import LineCollection
 from matplotlib.colors import Colormap
+from matplotlib.image import AxesImage
 from numpy import ndarray
 from tifffile import tifffile
 
@@ -31,8 +33,14 @@ class AbstractImageVisualizer(Visualizer):
     DEFAULT_SIZE = (30, 1000, 1000)
     _MOUSE_WHEEL_ZOOM_SCALE = 1.2
     _MOUSE_WHEEL_TRANSLATE_SCALE = 8
+    _STEP_BURST_SECONDS = 0.15  # If the user steps through z or time faster than this, we draw a low-resolution image
 
     _image_slice_2d: Optional[ndarray] = None
+    _image_artist: Optional[AxesImage] = None  # Reused by _draw_image, so that not every redraw creates a new one
+
+    _last_step_time: float = 0  # Last time the user moved in z or time, see _is_in_step_burst
+    _draw_low_resolution: bool = False
+    _full_resolution_timer = None  # Timer used to redraw the image in full resolution after a burst of steps
 
     # The color map should typically not be transferred when switching to another viewer, so it is not part of the
     # display_settings property
@@ -138,16 +146,58 @@ class AbstractImageVisualizer(Visualizer):
         self._draw_extra()
         self._window.set_figure_title(self._get_figure_title())
 
-        self._fig.canvas.draw()
+        self._fig.canvas.draw_idle()
 
     def _draw_image(self):
         if self._image_slice_2d is not None:
             offset = self._experiment.images.offsets.of_time_point(self._time_point)
             extent = (offset.x, offset.x + self._image_slice_2d.shape[1],
                       offset.y + self._image_slice_2d.shape[0], offset.y)
-            self._ax.imshow(self._image_slice_2d, cmap=self._color_map, extent=extent)
+            image = self._image_slice_2d
+            clim = (image.min(), image.max()) if len(image.shape) == 2 else None  # Of the full image, also in low-res
+            if self._draw_low_resolution:
+                # The user is quickly stepping through the images, so only draw a quarter of the pixels for now
+                image = image[::2, ::2]
+                self._schedule_full_resolution_redraw()
+            image_artist = self._image_artist
+            if image_artist is None or image_artist.colorbar is not None:
+                self._image_artist = self._ax.imshow(image, cmap=self._color_map, extent=extent)
+                if clim is not None:
+                    self._image_artist.set_clim(*clim)
+            else:
+                # The axis was cleared, but we can put the old image artist back with the new data. This is quite a
+                # bit faster than creating a new artist, especially when scrolling through the z-layers
+                image_artist.set_data(image)
+                image_artist.set_cmap(self._color_map)
+                if clim is not None:
+                    image_artist.set_clim(*clim)
+                image_artist.set_clip_path(self._ax.patch)
+                self._ax.add_image(image_artist)
+                image_artist.set_extent(extent)
             self._ax.set_aspect("equal", adjustable="datalim")
 
+    def _schedule_full_resolution_redraw(self):
+        """Redraws the view (in full resolution) once the user has stopped stepping through the images."""
+        if self._full_resolution_timer is None:
+            self._full_resolution_timer = self._fig.canvas.new_timer(interval=int(self._STEP_BURST_SECONDS * 1000))
+            self._full_resolution_timer.single_shot = True
+            self._full_resolution_timer.add_callback(self.draw_view)
+        self._full_resolution_timer.stop()
+        self._full_resolution_timer.start()
+
+    def detach(self):
+        super().detach()
+        if self._full_resolution_timer is not None:
+            # Otherwise this visualizer would still redraw itself after another visualizer has been activated
+            self._full_resolution_timer.stop()
+
+    def _is_in_step_burst(self) -> bool:
+        """Records that the user moved in z or time, and returns whether the previous move was only just before."""
+        now = time.perf_counter()
+        in_burst = now - self._last_step_time < self._STEP_BURST_SECONDS
+        self._last_step_time = now
+        return in_burst
+
     def _draw_selection(self, position: Position, color: MPLColor):
         """Draws a marker for the given position that indicates that the position is selected. Subclasses can call this
         method to show a position selection.
@@ -162,12 +212,18 @@ class AbstractImageVisualizer(Visualizer):
         shape.draw2d(position.x, position.y, dz, dt, self._ax, color, "black")
 
     def _draw_beacons(self):
+        beacons_x_list, beacons_y_list, beacons_marker_sizes = list(), list(), list()
         for beacon in self._experiment.beacons.of_time_point(self._time_point):
             dz = self._z - round(beacon.z)
             if abs(dz) > self.MAX_Z_DISTANCE * 2:
                 continue
-            self._ax.scatter(beacon.x, beacon.y, marker='*', facecolor=core.COLOR_CELL_CURRENT,
-                             edgecolors="black", s=(20 - abs(dz)) ** 2, linewidths=2)
+            beacons_x_list.append(beacon.x)
+            beacons_y_list.append(beacon.y)
+            beacons_marker_sizes.append((20 - abs(dz)) ** 2)
+
+        if len(beacons_x_list) > 0:
+            self._ax.scatter(beacons_x_list, beacons_y_list, marker='*', facecolor=core.COLOR_CELL_CURRENT,
+                             edgecolors="black", s=beacons_marker_sizes, linewidths=2)
 
     def _draw_annotation(self, position: Position, text: str, *, text_color: MPLColor = "black",
                          background_color: MPLColor = (1, 1, 1, 0.8)):
@@ -247,6 +303,7 @@ class AbstractImageVisualizer(Visualizer):
 
     def _draw_positions_of_time_point(self, time_point: TimePoint, color: str = core.COLOR_CELL_CURRENT):
         position_data = self._experiment.position_data
+        gui_experiment = self.get_window().get_gui_experiment()
         dt = time_point.time_point_number() - self._time_point.time_point_number()
         show_errors = self._display_settings.show_errors
 
@@ -254,12 +311,16 @@ class AbstractImageVisualizer(Visualizer):
             list(), list(), list(), list(), list()
         crosses_x_list, crosses_y_list = list(), list()
 
-        min_z, max_z = self._z - self.MAX_Z_DISTANCE, self._z + self.MAX_Z_DISTANCE
+        # Bind everything needed in the loop to local variables, as this loop runs for every visible position
+        z = self._z
+        on_position_draw = self._on_position_draw
+        get_marker_by_save_name = gui_experiment.get_marker_by_save_name
+        min_z, max_z = z - self.MAX_Z_DISTANCE, z + self.MAX_Z_DISTANCE
         for position in self._experiment.positions.of_time_point_and_z(time_point, min_z, max_z):
-            dz = self._z - round(position.z)
+            dz = z - round(position.z)
 
             # Draw the position, making it selectable
-            if not self._on_position_draw(position, color, dz, dt):
+            if not on_position_draw(position, color, dz, dt):
                 continue
 
             # Add error marker
@@ -268,8 +329,7 @@ class AbstractImageVisualizer(Visualizer):
                 crosses_y_list.append(position.y)
 
             # Add marker
-            position_type = self.get_window().get_gui_experiment().get_marker_by_save_name(
-                position_markers.get_position_type(position_data, position))
+            position_type = get_marker_by_save_name(position_markers.get_position_type(position_data, position))
             edge_color = (0, 0, 0) if position_type is None else position_type.mpl_color
             edge_width = 1 if position_type is None else 3
 
@@ -280,11 +340,19 @@ class AbstractImageVisualizer(Visualizer):
             dz_penalty = 0 if dz == 0 else abs(dz) + 1
             positions_marker_sizes.append(max(1, 7 - dz_penalty - abs(dt) + edge_width) ** 2)
 
-        self._ax.scatter(crosses_x_list, crosses_y_list, marker='X', facecolor='black', edgecolors="white",
-                         s=17**2, linewidths=2)
-        marker = "s" if dt == 0 else "o"
-        self._ax.scatter(positions_x_list, positions_y_list, s=positions_marker_sizes, facecolor=color,
-                         edgecolors=positions_edge_colors, linewidths=positions_edge_widths, marker=marker)
+        # Draw everything in as few artists as possible, and don't create artists if there is nothing to draw. The
+        # coordinates and sizes are passed as arrays, as scatter converts lists element by element into masked arrays
+        if len(crosses_x_list) > 0:
+            self._ax.scatter(numpy.array(crosses_x_list), numpy.array(crosses_y_list), marker='X', facecolor='black',
+                             edgecolors="white", s=17**2, linewidths=2)
+        if len(positions_x_list) > 0:
+            marker = "s" if dt == 0 else "o"
+            if len(set(positions_edge_widths)) == 1:
+                # Matplotlib does some work for every line width, so pass just one if they're all the same
+                positions_edge_widths = positions_edge_widths[0]
+            self._ax.scatter(numpy.array(positions_x_list), numpy.array(positions_y_list),
+                             s=numpy.array(positions_marker_sizes), facecolor=color, edgecolors=positions_edge_colors,
+                             linewidths=positions_edge_widths, marker=marker)
 
     def _on_position_draw(self, position: Position, color: str, dz: int, dt: int) -> bool:
         """Called whenever a position is being drawn. Return False to prevent drawing of this position."""
@@ -314,22 +382,32 @@ class AbstractImageVisualizer(Visualizer):
         if not self._display_settings.show_links_and_connections:
             return
 
-        lines = []
-        colors = []
+        lines_to_next = []
+        lines_to_previous = []
+        z = self._z
+        max_z_distance = self.MAX_Z_DISTANCE
         for position1, position2 in self._experiment.links.of_time_point(self._time_point):
-            min_display_z = min(position1.z, position2.z) - self.MAX_Z_DISTANCE
-            max_display_z = max(position1.z, position2.z) + self.MAX_Z_DISTANCE
-            if self._z < min_display_z or self._z > max_display_z:
+            if z < min(position1.z, position2.z) - max_z_distance or z > max(position1.z, position2.z) + max_z_distance:
                 continue
 
             line = (position1.x, position1.y), (position2.x, position2.y)
-            lines.append(line)
-            color = core.COLOR_CELL_NEXT if position2.time_point_number() > position1.time_point_number()\
-                else core.COLOR_CELL_PREVIOUS
-            colors.append(color)
+            if position2.time_point_number() > position1.time_point_number():
+                lines_to_next.append(line)
+            else:
+                lines_to_previous.append(line)
 
-        linewidths = [1]
-        self._ax.add_collection(LineCollection(lines, colors=colors, linewidths=linewidths))
+        self._draw_line_segments(lines_to_next, core.COLOR_CELL_NEXT)
+        self._draw_line_segments(lines_to_previous, core.COLOR_CELL_PREVIOUS)
+
+    def _draw_line_segments(self, lines: List[Tuple[Tuple[float, float], Tuple[float, float]]], color: MPLColor):
+        """Draws all line segments as a single line, with NaN values in between to separate the segments. For
+        Matplotlib, this is a lot cheaper than a LineCollection, which creates a path for every segment."""
+        if len(lines) == 0:
+            return
+        coords = numpy.full((len(lines), 3, 2), numpy.nan)
+        coords[:, 0:2] = lines
+        coords = coords.reshape(-1, 2)
+        self._ax.plot(coords[:, 0], coords[:, 1], color=color, linewidth=1)
 
     def _draw_data_axes(self):
         """Draws the data axis, which is usually the crypt axis."""
@@ -356,30 +434,43 @@ class AbstractImageVisualizer(Visualizer):
 
     def _get_position_at(self, x: Optional[int], y: Optional[int]) -> Optional[Position]:
         """Wrapper of get_closest_position that makes use of the fact that we can lookup all positions ourselves."""
+        if x is None or y is None:
+            return None  # Mouse outside figure
         min_z = self._z - self.MAX_Z_DISTANCE
         max_z = self._z + self.MAX_Z_DISTANCE
 
         # Find all drawn positions
-        selectable_positions = set(self._experiment.positions.of_time_point_and_z(self._time_point, min_z, max_z))
+        selectable_positions = list(self._experiment.positions.of_time_point_and_z(self._time_point, min_z, max_z))
         if self._must_draw_positions_of_previous_time_point():
             try:
                 previous_time_point = self._experiment.get_previous_time_point(self._time_point)
             except ValueError:
                 pass
             else:
-                for position in self._experiment.positions.of_time_point_and_z(previous_time_point, min_z, max_z):
-                    selectable_positions.add(position)
+                selectable_positions += self._experiment.positions.of_time_point_and_z(previous_time_point, min_z,
+                                                                                       max_z)
         if self._must_draw_positions_of_next_time_point():
             try:
                 next_time_point = self._experiment.get_next_time_point(self._time_point)
             except ValueError:
                 pass
             else:
-                for position in self._experiment.positions.of_time_point_and_z(next_time_point, min_z, max_z):
-                    selectable_positions.add(position)
-
-        # Find nearest position
-        return Visualizer.get_closest_position(selectable_positions, x, y, None, self._time_point, max_distance=5)
+                selectable_positions += self._experiment.positions.of_time_point_and_z(next_time_point, min_z, max_z)
+        if len(selectable_positions) == 0:
+            return None
+
+        # Find nearest position. Same as Visualizer.get_closest_position with a max distance of 5 px, but we calculate
+        # all distances at once using NumPy, which is a lot faster for thousands of positions
+        count = len(selectable_positions)
+        dx = numpy.fromiter((position.x for position in selectable_positions), dtype=numpy.float64, count=count) - x
+        dy = numpy.fromiter((position.y for position in selectable_positions), dtype=numpy.float64, count=count) - y
+        dt = numpy.fromiter((position.time_point_number() for position in selectable_positions), dtype=numpy.float64,
+                            count=count) - self._time_point.time_point_number()
+        distances_squared = dx ** 2 + dy ** 2 + dt ** 2
+        closest_index = int(distances_squared.argmin())
+        if distances_squared[closest_index] >= 5 ** 2:
+            return None
+        return selectable_positions[closest_index]
 
     def get_extra_menu_options(self) -> Dict[str, Any]:
         def time_point_prompt():
@@ -444,7 +535,7 @@ class AbstractImageVisualizer(Visualizer):
         if event.button == "up":
             shift_y *= -1  # Inverse direction
         self._ax.set_ylim(old_ylim[0] + shift_y, old_ylim[1] + shift_y)
-        self._fig.canvas.draw()
+        self._fig.canvas.draw_idle()
 
     def _scroll_shift_x(self, event: MouseEvent):
         old_xlim = self._ax.get_xlim()
@@ -453,7 +544,7 @@ class AbstractImageVisualizer(Visualizer):
         if event.button == "up":
             shift_x *= -1  # Inverse direction
         self._ax.set_xlim(old_xlim[0] + shift_x, old_xlim[1] + shift_x)
-        self._fig.canvas.draw()
+        self._fig.canvas.draw_idle()
 
     def _scroll_zoom(self, event: MouseEvent):
         old_xlim = self._ax.get_xlim()
@@ -473,7 +564,7 @@ class AbstractImageVisualizer(Visualizer):
         # noinspection PyTypeChecker
         self._ax.set_ylim([old_ydata - (old_ydata - old_ylim[0]) / scale_factor,
                            old_ydata + (old_ylim[1] - old_ydata) / scale_factor])
-        self._fig.canvas.draw()
+        self._fig.canvas.draw_idle()
 
     def _on_command(self, command: str) -> bool:
         if command.startswith("track "):
@@ -556,35 +647,38 @@ class AbstractImageVisualizer(Visualizer):
         image_shape = image_3d.shape
 
         if len(image_shape) == 3 and isinstance(self._color_map, Colormap):
-            # Convert grayscale image to colored using the stored color map
-            flat_image = images.ravel()
-            images = self._color_map(flat_image, bytes=True)[:, 0:3]
-            new_shape = (image_shape[0], image_shape[1], image_shape[2], 3)
-            images = images.reshape(new_shape)
-        else:
-            # Color images can be kept as is - they were already rescaled by the convertScaleAbs function, and no
-            # other transformations are necessary
-            pass
-
-        # If the three color channels are the same, just use one channel
-        # This happens if self._color_map is a grayscale color map
-        if images.shape[3] == 3 and (images[:, :, :, 0] == images[:, :, :, 1]).all()\
+            # Convert grayscale image to colored using the stored color map. The image is 8-bit, so we only need to
+            # look up 256 colors, and then we can look up the color of every pixel in that table
+            lookup_table = self._color_map(numpy.arange(256), bytes=True)[:, 0:3]
+            if (lookup_table[:, 0] == lookup_table[:, 1]).all() and (lookup_table[:, 0] == lookup_table[:, 2]).all():
+                # Grayscale color map, so just use one channel
+                lookup_table = lookup_table[:, 0]
+            images = numpy.take(lookup_table, images, axis=0)
+        elif images.shape[3] == 3 and (images[:, :, :, 0] == images[:, :, :, 1]).all()\
                 and (images[:, :, :, 0] == images[:, :, :, 2]).all():
+            # Color images were already rescaled by the convertScaleAbs function. If the three color channels are the
+            # same, just use one channel
             images = images[:, :, :, 0]
 
         tifffile.imsave(file, images, compress=9)
 
+    def _refresh_image(self):
+        """Reloads the displayed image and redraws. Unlike self._move_in_time(0), this doesn't recalculate the
+        metadata of the time point, which can be slow and doesn't depend on how the image is displayed."""
+        self._load_2d_image()
+        self.draw_view()
+
     def _toggle_showing_next_time_point(self):
         self._display_settings.show_next_time_point = not self._display_settings.show_next_time_point
-        self._move_in_time(0)  # Refreshes image
+        self._refresh_image()
 
     def _toggle_showing_images(self):
         self._display_settings.show_images = not self._display_settings.show_images
-        self._move_in_time(0)  # Refreshes image
+        self._refresh_image()
 
     def _toggle_showing_reconstruction(self):
         self._display_settings.show_reconstruction = not self._display_settings.show_reconstruction
-        self._move_in_time(0)  # Refreshes image
+        self._refresh_image()
 
     def _toggle_showing_splines(self):
         self._display_settings.show_splines = not self._display_settings.show_splines
@@ -607,7 +701,11 @@ class AbstractImageVisualizer(Visualizer):
         activate(ImageSliceViewer(self._window, self.__class__))
 
     def _move_in_z(self, dz: int) -> bool:
-        return self._move_to_z(self._display_settings.z + dz)
+        self._draw_low_resolution = self._is_in_step_burst()
+        try:
+            return self._move_to_z(self._display_settings.z + dz)
+        finally:
+            self._draw_low_resolution = False
 
     def _move_to_z(self, new_z: int) -> bool:
         """Moves to another z and redraws. Returns false and does nothing else if the given z does not exist."""
@@ -728,7 +826,11 @@ class AbstractImageVisualizer(Visualizer):
             self._clamp_z()
             self._load_2d_image()
             self._calculate_time_point_metadata()
-            self.draw_view()
+            self._draw_low_resolution = dt != 0 and self._is_in_step_burst()
+            try:
+                self.draw_view()
+            finally:
+                self._draw_low_resolution = False
             self.update_status(self.get_default_status())
 
     def _move_in_channel(self, dc: int):
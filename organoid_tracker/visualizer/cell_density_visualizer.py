@@ -30,15 +30,13 @@ class CellDensityVisualizer(ExitableImageVisualizer):
         resolution = self._experiment.images.resolution()
         min_density = None
         max_density = None
-        densities = dict()
+        densities = cell_density_calculator.get_densities_mm1(positions, resolution)
 
-        for position in positions:
-            cell_density = cell_density_calculator.get_density_mm1(positions, around=position, resolution=resolution)
+        for cell_density in densities.values():
             if min_density is None or cell_density < min_density:
                 min_density = cell_density
             if max_density is None or cell_density > max_density:
                 max_density = cell_density
-            densities[position] = cell_density
 
         self._min_cell_density = min_density
         self._max_cell_density = max_density
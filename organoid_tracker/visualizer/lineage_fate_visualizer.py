@@ -115,11 +115,9 @@ class LineageFateVisualizer(ExitableImageVisualizer):
 
         lineage_fate = self._lineage_fates.get(position)
         background_color = (0.2, 0.2, 0.2)
-        try:
-            axis_fraction = self._position_to_axis[position] / self._highest_position
-            background_color = matplotlib.cm.jet(axis_fraction)
-        except KeyError:
-            pass  # Not interesting
+        axis_position = self._position_to_axis.get(position)
+        if axis_position is not None:  # Otherwise, not interesting
+            background_color = matplotlib.cm.jet(axis_position / self._highest_position)
         text_color = "black" if sum(background_color) / len(background_color) > 0.6 else "white"
         self._draw_annotation(position, _lineage_fate_to_text(lineage_fate), text_color=text_color,
                               background_color=background_color)
@@ -1,6 +1,7 @@
 """Lineage tree visualizer with a lot of options for showing colors, showing hiding certain trees, etc."""
 
-from typing import Dict, Any, Tuple, Optional
+import bisect
+from typing import Dict, Any, Tuple, Optional, List
 
 import matplotlib.cm
 import matplotlib.colors
@@ -248,10 +249,17 @@ class LineageTreeVisualizer(Visualizer):
 
         self._calculate_track_colors()
         axis_positions, highest_axis_position = self._calculate_axis_positions_if_enabled()
+        error_time_points_by_track_id = dict()  # Filled on demand by color_getter, uses id(track) as key
 
         def color_getter(time_point_number: int, track: LinkingTrack) -> Tuple[float, float, float]:
             if self._display_warnings:
-                if _has_error_close_in_time(position_data, time_point_number, track):
+                # The color getter is called for every time point of every track, so we want a cheap dictionary
+                # lookup. Hashing the track itself would hash its first position, so we use id(track) instead
+                error_time_points = error_time_points_by_track_id.get(id(track))
+                if error_time_points is None:
+                    error_time_points = _find_error_time_points(position_data, track)
+                    error_time_points_by_track_id[id(track)] = error_time_points
+                if _has_error_close_in_time(error_time_points, time_point_number):
                     return 0.7, 0.7, 0.7
 
             if self._display_deaths and track.max_time_point_number() - time_point_number < 10:
@@ -315,10 +323,13 @@ class LineageTreeVisualizer(Visualizer):
         return 1.5
 
 
-def _has_error_close_in_time(position_data: PositionData, time_point_number: int, track: LinkingTrack, time_window: int = 5):
-    min_t = max(track.min_time_point_number(), time_point_number - time_window)
-    max_t = min(track.max_time_point_number(), time_point_number + time_window)
-    for t in range(min_t, max_t + 1):
-        if linking_markers.get_error_marker(position_data, track.find_position_at_time_point_number(t)):
-            return True
-    return False
+def _find_error_time_points(position_data: PositionData, track: LinkingTrack) -> List[int]:
+    """Gets the time point numbers of all positions in the track with an error, from low to high."""
+    return [position.time_point_number() for position in track.positions()
+            if linking_markers.get_error_marker(position_data, position)]
+
+
+def _has_error_close_in_time(error_time_points: List[int], time_point_number: int, time_window: int = 5) -> bool:
+    """Checks if there's an error at most time_window time points away. error_time_points must be sorted."""
+    index = bisect.bisect_left(error_time_points, time_point_number - time_window)
+    return index < len(error_time_points) and error_time_points[index] <= time_point_number + time_window
@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict, Any, Type
 
+import numpy
 from matplotlib.backend_bases import KeyEvent
 
 from organoid_tracker import core
@@ -112,6 +113,8 @@ class PositionListVisualizer(Visualizer):
 
     def _draw_connections(self, links: Links, main_position: Position, line_style:str = "solid",
                           line_width: int = 1):
+        lines_by_color = dict()
+        markers = []
         for connected_position in links.find_links_of(main_position):
             delta_time = 1
             if connected_position.time_point_number() < main_position.time_point_number():
@@ -122,13 +125,24 @@ class PositionListVisualizer(Visualizer):
             color = core.COLOR_CELL_NEXT if delta_time == 1 else core.COLOR_CELL_PREVIOUS
             dz = round(self._position_list[self._current_position_index].z) - round(connected_position.z)
 
-            self._ax.plot([connected_position.x, main_position.x], [connected_position.y, main_position.y],
-                          color=color, linestyle=line_style, linewidth=line_width)
+            lines_by_color.setdefault(color, []).append(((connected_position.x, connected_position.y),
+                                                         (main_position.x, main_position.y)))
+            markers.append((connected_position, dz, delta_time, color))
+
+        # Draw the lines of each color as a single line, with NaN values in between to separate the segments. The lines
+        # are drawn first, so that they end up below the markers
+        for color, lines in lines_by_color.items():
+            coords = numpy.full((len(lines), 3, 2), numpy.nan)
+            coords[:, 0:2] = lines
+            coords = coords.reshape(-1, 2)
+            self._ax.plot(coords[:, 0], coords[:, 1], color=color, linestyle=line_style, linewidth=line_width)
+
+        for connected_position, dz, delta_time, color in markers:
             edge_color = self._get_type_color(connected_position)
             if edge_color is None:
                 edge_color = "black"
             shape.draw_marker_2d(connected_position.x, connected_position.y, dz, delta_time, self._ax, color,
-                                             edge_color)
+                                 edge_color)
 
     def _show_image(self):
         current_position = self._position_list[self._current_position_index]
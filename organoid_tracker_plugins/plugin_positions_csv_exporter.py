@@ -252,12 +252,13 @@ def _write_positions_and_metadata_to_csv(positions: PositionCollection, position
                               "cell_type_id,hours_until_division,hours_until_dead,hours_since_division,lineage_id,"
                               "original_track_id\n")
             positions_of_time_point = positions.of_time_point(time_point)
+            densities = cell_density_calculator.get_densities_mm1(positions_of_time_point, resolution)
             for position in positions_of_time_point:
                 lineage_id = lineage_id_creator.get_lineage_id(links, position)
                 original_track_id = lineage_id_creator.get_original_track_id(links, position)
                 cell_type_id = cell_types_to_id.get_or_add_id(
                     position_markers.get_position_type(position_data, position))
-                density = cell_density_calculator.get_density_mm1(positions_of_time_point, position, resolution)
+                density = densities[position]
                 times_divided = cell_division_counter.find_times_divided(links, position, first_time_point_number)
                 times_neighbor_died = deaths_nearby_tracks.count_nearby_deaths_in_past(links, position)
                 cell_compartment_id = cell_compartment_finder.find_compartment_ext(positions, links, resolution,
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy
+from numpy import ndarray
+
+from organoid_tracker.core import TimePoint
+from organoid_tracker.image_loading.builtin_image_filters import MultiplyPixelsFilter, ThresholdFilter
+
+
+def _multiply_reference(image: ndarray, factor: float) -> ndarray:
+    """How MultiplyPixelsFilter worked before it was optimized, using a full copy of the image. The only differences are
+    that float images are no longer clipped at a rounded value, and the result keeps the data type of the image."""
+    max_value = image.max()
+    if int(factor) == factor:
+        new_max = max_value / factor
+        if numpy.issubdtype(image.dtype, numpy.integer):
+            new_max = int(new_max)
+        result = image.copy()
+        result[result > new_max] = new_max
+        return result * int(factor)
+
+    scaled = image * factor
+    scaled[scaled > max_value] = max_value
+    return scaled.astype(image.dtype)
+
+
+class TestMultiplyPixelsFilter(unittest.TestCase):
+
+    def _test_image(self, dtype) -> ndarray:
+        random = numpy.random.RandomState(1)
+        if numpy.issubdtype(dtype, numpy.integer):
+            image = random.randint(0, 200, size=(3, 10, 12)).astype(dtype)
+            image[1, 2, 3] = 199  # Make sure the max is odd
+            return image
+        return random.rand(3, 10, 12).astype(dtype)
+
+    def test_matches_reference(self):
+        for dtype in [numpy.uint8, numpy.uint16, numpy.float32]:
+            for factor in [0.5, 1, 1.5, 2]:
+                for use_3d in [True, False]:
+                    with self.subTest(dtype=dtype, factor=factor, use_3d=use_3d):
+                        image = self._test_image(dtype)
+                        if not use_3d:
+                            image = image[1]
+                        expected = _multiply_reference(image, factor)
+
+                        MultiplyPixelsFilter(factor).filter(TimePoint(1), None if use_3d else 1, image)
+                        self.assertEqual(numpy.dtype(dtype), image.dtype)
+                        numpy.testing.assert_allclose(expected, image, rtol=1e-6)
+
+    def test_keeps_max(self):
+        image = numpy.array([[10, 150, 199]], dtype=numpy.uint8)
+        MultiplyPixelsFilter(1.5).filter(TimePoint(1), 0, image)
+        numpy.testing.assert_array_equal([[15, 199, 199]], image)
+
+
+class TestThresholdFilter(unittest.TestCase):
+
+    def test_2d_and_3d(self):
+        random = numpy.random.RandomState(2)
+        for dtype in [numpy.uint8, numpy.uint16, numpy.float32]:
+            for shape in [(10, 12), (3, 10, 12)]:
+                with self.subTest(dtype=dtype, shape=shape):
+                    image = (random.rand(*shape) * 200).astype(dtype)
+                    expected = image.copy()
+                    expected[expected < 0.3 * expected.max()] = 0
+
+                    ThresholdFilter(0.3).filter(TimePoint(1), None if len(shape) == 3 else 0, image)
+                    numpy.testing.assert_array_equal(expected, image)
+
+    def test_keeps_pixels_at_threshold(self):
+        image = numpy.array([[9, 10, 11, 100]], dtype=numpy.uint8)
+        ThresholdFilter(0.1).filter(TimePoint(1), 0, image)
+        numpy.testing.assert_array_equal([[0, 10, 11, 100]], image)
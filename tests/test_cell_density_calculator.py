@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from organoid_tracker.core.position import Position
+from organoid_tracker.core.position_collection import PositionCollection
+from organoid_tracker.core.resolution import ImageResolution
+from organoid_tracker.position_analysis import cell_density_calculator
+
+
+class TestCellDensityCalculator(unittest.TestCase):
+
+    def test_densities_match_single_density(self):
+        """get_densities_mm1 must give the same result as calling get_density_mm1 for every position."""
+        resolution = ImageResolution(0.32, 0.32, 2, 12)
+        rng = random.Random(12)
+        positions = PositionCollection()
+        for time_point_number, count in [(1, 1), (2, 4), (3, 7), (4, 200)]:
+            for i in range(count):
+                # Integer grid, so that there are many ties in distance
+                positions.add(Position(rng.randint(0, 30), rng.randint(0, 30), rng.randint(0, 5),
+                                       time_point_number=time_point_number))
+
+        for time_point in positions.time_points():
+            positions_of_time_point = positions.of_time_point(time_point)
+            densities = cell_density_calculator.get_densities_mm1(positions_of_time_point, resolution)
+            self.assertEqual(len(positions_of_time_point), len(densities))
+            for position in positions_of_time_point:
+                expected = cell_density_calculator.get_density_mm1(positions_of_time_point, position, resolution)
+                self.assertAlmostEqual(expected, densities[position], places=9)
+
+    def test_single_position(self):
+        position = Position(1, 2, 3, time_point_number=1)
+        densities = cell_density_calculator.get_densities_mm1([position], ImageResolution(1, 1, 1, 1))
+        self.assertEqual({position: 0}, densities)
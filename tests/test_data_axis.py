@@ -2,8 +2,9 @@ import unittest
 
 import numpy
 
+from organoid_tracker.core import TimePoint
 from organoid_tracker.core.position import Position
-from organoid_tracker.core.spline import Spline
+from organoid_tracker.core.spline import Spline, SplineCollection
 
 
 class TestDataAxis(unittest.TestCase):
@@ -49,6 +50,16 @@ class TestDataAxis(unittest.TestCase):
         self.assertAlmostEqual(10, x, places=1)
         self.assertAlmostEqual(0, y, places=1)
 
+    def test_past_end_of_two_point_path(self):
+        path = Spline()
+        path.add_point(0, 0, 0)
+        path.add_point(100, 0, 0)
+
+        # Same results as when the straight line was interpolated by SciPy
+        self.assertAlmostEqual(117.91, path.to_position_on_axis(Position(150, 0, 0)).pos, places=2)
+        self.assertAlmostEqual(110.0, path.to_position_on_axis(Position(120, 50, 0)).pos, places=2)
+        self.assertAlmostEqual(106.18, path.to_position_on_axis(Position(110, 100, 0)).pos, places=2)
+
     def test_reposition_offset(self):
         path = Spline()
         path.add_point(0, 0, 0)
@@ -58,3 +69,26 @@ class TestDataAxis(unittest.TestCase):
         self.assertEqual(5, path.to_position_on_axis(Position(5, 0, 0)).pos)
         path.update_offset_for_positions([Position(5, 0, 0), Position(6, 0, 0)])
         self.assertEqual(0, path.to_position_on_axis(Position(5, 0, 0)).pos)  # Make sure zero-point has moved
+
+    def test_closest_spline_in_collection(self):
+        time_point = TimePoint(1)
+        lower_path = Spline()
+        lower_path.add_point(0, 0, 0)
+        lower_path.add_point(20, 0, 0)
+        upper_path = Spline()
+        upper_path.add_point(0, 10, 0)
+        upper_path.add_point(20, 10, 0)
+        splines = SplineCollection()
+        lower_id = splines.add_spline(time_point, lower_path, None)
+        upper_id = splines.add_spline(time_point, upper_path, None)
+
+        spline_position = splines.to_position_on_spline(Position(5, 7, 0, time_point=time_point))
+        self.assertEqual(upper_id, spline_position.spline_id)
+        self.assertAlmostEqual(5, spline_position.pos)
+        self.assertAlmostEqual(3, spline_position.distance)
+
+        # Move the upper spline away, now the lower spline must be the closest
+        upper_path.move_points(Position(0, 20, 0))
+        spline_position = splines.to_position_on_spline(Position(5, 7, 0, time_point=time_point))
+        self.assertEqual(lower_id, spline_position.spline_id)
+        self.assertAlmostEqual(7, spline_position.distance)
@@ -2,7 +2,7 @@ import unittest
 
 from organoid_tracker.core.position import Position
 from organoid_tracker.core.resolution import ImageResolution
-from organoid_tracker.linking.nearby_position_finder import find_closest_n_positions
+from organoid_tracker.linking.nearby_position_finder import find_closest_n_positions, find_closest_position
 
 
 class TestFindNearestFew(unittest.TestCase):
@@ -13,3 +13,13 @@ class TestFindNearestFew(unittest.TestCase):
         self.assertEqual(
             {Position(0,0,0), Position(0,2,0), Position(0,1,0)},
             find_closest_n_positions(system, around=Position(0, -1, 0), max_amount=3, resolution=resolution))
+
+    def test_find_closest_position(self):
+        resolution = ImageResolution(1, 1, 1, 1)
+        system = [Position(0, 0, 10), Position(0, 7, 0), Position(0, 2, 0)]
+        self.assertEqual(Position(0, 2, 0), find_closest_position(system, around=Position(0, 0, 0),
+                                                                  resolution=resolution))
+        self.assertEqual(Position(0, 0, 10), find_closest_position(system, around=Position(0, 0, 0),
+                                                                   resolution=resolution, ignore_z=True))
+        self.assertIsNone(find_closest_position(system, around=Position(0, 0, 0), resolution=resolution,
+                                                max_distance_um=1))
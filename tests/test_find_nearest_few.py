@@ -37,3 +37,9 @@ class TestFindNearestFew(unittest.TestCase):
         positions.add(Position(100, 20, 0, time_point=time_point))
         found = find_close_positions(positions, around=Position(40, 20, 0), tolerance=1, resolution=_PX_RESOLUTION)
         self.assertEqual(1, len(found), "Tolerance is set to 1.0, so only one position may be found")
+
+    def test_duplicate_positions(self):
+        positions = [Position(10, 20, 0), Position(11, 20, 0), Position(10, 20, 0), Position(100, 20, 0)]
+        found = find_close_positions(positions, around=Position(40, 20, 0), tolerance=1.1, resolution=_PX_RESOLUTION)
+        self.assertEqual(2, len(found), "Position given twice, but must only be found once")
+        self.assertEqual({Position(10, 20, 0), Position(11, 20, 0)}, set(found))
@@ -0,0 +1,79 @@
+import unittest
+from typing import Optional
+
+import numpy
+from numpy import ndarray
+
+from organoid_tracker.core import TimePoint
+from organoid_tracker.core.image_filters import ImageFilter, ImageFilters
+from organoid_tracker.core.image_loader import ImageChannel
+
+_CHANNEL = ImageChannel(index_zero=0)
+
+
+class _CountingFilter(ImageFilter):
+    """Adds one to the image, and counts how often it was called."""
+
+    def __init__(self):
+        self.call_count = 0
+
+    def filter(self, time_point: TimePoint, image_z: Optional[int], image: ndarray):
+        self.call_count += 1
+        image += 1
+
+    def copy(self):
+        return _CountingFilter()
+
+    def get_name(self) -> str:
+        return "Counting"
+
+
+class TestImageFiltersCache(unittest.TestCase):
+
+    def setUp(self):
+        self.counting_filter = _CountingFilter()
+        self.filters = ImageFilters()
+        self.filters.add_filter(_CHANNEL, self.counting_filter)
+
+    def _filter(self, time_point_number: int, array: ndarray) -> ndarray:
+        return self.filters.filter(TimePoint(time_point_number), _CHANNEL, 0, array)
+
+    def test_hit(self):
+        array = numpy.zeros((2, 2))
+        first = self._filter(1, array)
+        second = self._filter(1, array)
+        self.assertIs(first, second)
+        self.assertEqual(1, self.counting_filter.call_count)
+        self.assertEqual(0, array[0, 0])  # Input not modified
+
+    def test_miss_on_new_array(self):
+        self._filter(1, numpy.zeros((2, 2)))
+        result = self._filter(1, numpy.full((2, 2), 5))  # Same key, but another input array
+        self.assertEqual(6, result[0, 0])
+        self.assertEqual(2, self.counting_filter.call_count)
+
+    def test_evicts_least_recently_used(self):
+        arrays = [numpy.zeros((2, 2)) for _ in range(ImageFilters._CACHE_SIZE)]
+        for i, array in enumerate(arrays):
+            self._filter(i, array)
+        self._filter(0, arrays[0])  # Hit, so time point 0 is now the most recently used
+        self._filter(100, numpy.zeros((2, 2)))  # Full, so time point 1 must be removed
+        self.assertEqual(ImageFilters._CACHE_SIZE + 1, self.counting_filter.call_count)
+
+        self._filter(0, arrays[0])
+        self.assertEqual(ImageFilters._CACHE_SIZE + 1, self.counting_filter.call_count)
+        self._filter(1, arrays[1])
+        self.assertEqual(ImageFilters._CACHE_SIZE + 2, self.counting_filter.call_count)
+
+    def test_cleared_on_add_filter(self):
+        array = numpy.zeros((2, 2))
+        self._filter(1, array)
+        self.filters.add_filter(_CHANNEL, _CountingFilter())
+        self.assertEqual(2, self._filter(1, array)[0, 0])  # Both filters applied
+        self.assertEqual(2, self.counting_filter.call_count)
+
+    def test_cleared_on_clear_channel(self):
+        array = numpy.zeros((2, 2))
+        self._filter(1, array)
+        self.filters.clear_channel(_CHANNEL)
+        self.assertIs(array, self._filter(1, array))  # No filters anymore, so no cached result either
@@ -0,0 +1,129 @@
+import unittest
+from typing import Optional, Tuple
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy
+from numpy import ndarray
+
+from organoid_tracker.core import TimePoint
+from organoid_tracker.core.experiment import Experiment
+from organoid_tracker.core.image_loader import ImageLoader, ImageChannel
+from organoid_tracker.gui.window import DisplaySettings
+from organoid_tracker.visualizer.abstract_image_visualizer import AbstractImageVisualizer
+
+
+class _ArrayImageLoader(ImageLoader):
+    """Serves random images from memory."""
+
+    def get_3d_image_array(self, time_point: TimePoint, image_channel: ImageChannel) -> Optional[ndarray]:
+        return (numpy.random.RandomState(time_point.time_point_number()).rand(5, 40, 60) * 1000).astype(numpy.uint16)
+
+    def get_image_size_zyx(self) -> Optional[Tuple[int, int, int]]:
+        return 5, 40, 60
+
+    def first_time_point_number(self) -> Optional[int]:
+        return 1
+
+    def last_time_point_number(self) -> Optional[int]:
+        return 3
+
+    def get_channel_count(self) -> int:
+        return 1
+
+    def serialize_to_config(self) -> Tuple[str, str]:
+        return "", ""
+
+    def copy(self) -> ImageLoader:
+        return self
+
+
+class _GuiExperiment:
+    def get_marker_by_save_name(self, save_name: str):
+        return None
+
+
+class _Window:
+    """Just enough of a window for a visualizer, without needing Qt."""
+
+    def __init__(self, experiment: Experiment):
+        self._figure = plt.figure()
+        self._experiment = experiment
+        self.display_settings = DisplaySettings()
+        self.figure_titles = list()
+
+    def get_figure(self):
+        return self._figure
+
+    def get_experiment(self) -> Experiment:
+        return self._experiment
+
+    def get_gui_experiment(self) -> _GuiExperiment:
+        return _GuiExperiment()
+
+    def set_figure_title(self, title: str):
+        self.figure_titles.append(title)
+
+    def set_status(self, text: str):
+        pass
+
+    def unregister_event_handlers(self):
+        pass
+
+
+class _Timer:
+    """Records whether it is running, instead of calling anything."""
+
+    def __init__(self):
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+
+class TestImageVisualizerStepping(unittest.TestCase):
+
+    def setUp(self):
+        experiment = Experiment()
+        experiment.images.image_loader(_ArrayImageLoader())
+        self.window = _Window(experiment)
+        self.window.display_settings.z = 1
+        self.visualizer = AbstractImageVisualizer(self.window)
+        self.visualizer._full_resolution_timer = _Timer()
+        self.visualizer._load_2d_image()
+        self.visualizer.draw_view()
+
+    def tearDown(self):
+        plt.close(self.window.get_figure())
+
+    def test_single_step_full_resolution(self):
+        self.visualizer._last_step_time = 0  # Long ago
+        self.visualizer._move_in_z(1)
+        self.assertEqual((40, 60), self.visualizer._image_artist.get_array().shape)
+        self.assertFalse(self.visualizer._full_resolution_timer.running)
+
+    def test_quick_steps_low_resolution(self):
+        self.visualizer._move_in_z(1)
+        self.visualizer._move_in_z(1)  # Directly after the previous step
+        self.assertEqual((20, 30), self.visualizer._image_artist.get_array().shape)
+        self.assertTrue(self.visualizer._full_resolution_timer.running)
+
+        # The contrast must be the same as for the full image, otherwise the image flickers
+        full_image = self.visualizer._image_slice_2d
+        self.assertEqual((full_image.min(), full_image.max()), self.visualizer._image_artist.get_clim())
+
+        # Redrawing (what the timer does) shows the full image again
+        self.visualizer.draw_view()
+        self.assertEqual((40, 60), self.visualizer._image_artist.get_array().shape)
+
+    def test_detach_stops_redraw(self):
+        self.visualizer._move_in_time(1)
+        self.visualizer._move_in_time(1)
+        self.assertTrue(self.visualizer._full_resolution_timer.running)
+
+        self.visualizer.detach()
+        self.assertFalse(self.visualizer._full_resolution_timer.running)
@@ -25,3 +25,18 @@ class TestLinkingMarkers(unittest.TestCase):
         linking_markers.suppress_error_marker(position_data, position, Error.MOVED_TOO_FAST)
         self.assertEqual(None, linking_markers.get_error_marker(position_data, position), "error must be suppressed")
         self.assertTrue(linking_markers.is_error_suppressed(position_data, position, Error.MOVED_TOO_FAST))
+
+    def test_count_errored_positions(self):
+        position_data = PositionData()
+        position_1 = Position(2, 2, 2, time_point_number=2)
+        position_2 = Position(3, 2, 2, time_point_number=2)
+        position_3 = Position(4, 2, 2, time_point_number=3)
+        linking_markers.set_error_marker(position_data, position_1, Error.MOVED_TOO_FAST)
+        linking_markers.set_error_marker(position_data, position_2, Error.MOVED_TOO_FAST)
+        linking_markers.set_error_marker(position_data, position_3, Error.MOVED_TOO_FAST)
+        self.assertEqual(3, linking_markers.count_errored_positions(position_data))
+
+        linking_markers.suppress_error_marker(position_data, position_2, Error.MOVED_TOO_FAST)
+        linking_markers.suppress_error_marker(position_data, position_3, Error.NO_PAST_POSITION)  # Different error
+        self.assertEqual(2, linking_markers.count_errored_positions(position_data))
+        self.assertEqual({position_1, position_3}, set(linking_markers.find_errored_positions(position_data)))
@@ -23,3 +23,28 @@ class TestLinks(unittest.TestCase):
 
         self.assertEqual({past_position}, links.find_pasts(position))
         self.assertEqual(set(), links.find_pasts(past_position))
+
+    def test_add_track_of_positions_no_existing_links(self):
+        positions = [Position(i, 0, 0, time_point_number=i) for i in range(4)]
+        links = Links()
+        links.add_track_of_positions(positions)  # Creates the track in one go
+        links.debug_sanity_check()
+
+        self.assertEqual(1, len(list(links.find_all_tracks())))
+        for i, position in enumerate(positions):
+            self.assertEqual({positions[i + 1]} if i < len(positions) - 1 else set(), links.find_futures(position))
+            self.assertEqual({positions[i - 1]} if i > 0 else set(), links.find_pasts(position))
+
+    def test_add_track_of_positions(self):
+        positions = [Position(i, 0, 0, time_point_number=i) for i in range(4)]
+        links = Links()
+        links.add_link(Position(5, 5, 5, time_point_number=2), positions[3])  # Will become a merge of two tracks
+        links.add_track_of_positions(positions)
+        links.debug_sanity_check()
+
+        self.assertEqual({positions[1]}, links.find_futures(positions[0]))
+        self.assertEqual({positions[2], Position(5, 5, 5, time_point_number=2)}, links.find_pasts(positions[3]))
+
+        with self.assertRaises(ValueError):
+            links.add_track_of_positions([Position(0, 0, 0, time_point_number=10),
+                                          Position(0, 0, 0, time_point_number=12)])
@@ -0,0 +1,43 @@
+import unittest
+from typing import Set, FrozenSet
+
+from organoid_tracker.core.experiment import Experiment
+from organoid_tracker.core.links import Links
+from organoid_tracker.core.position import Position
+from organoid_tracker.core.resolution import ImageResolution
+from organoid_tracker.linking.nearest_neighbor_linker import nearest_neighbor
+
+# Time point 1 has only a single position, so that the KD-tree query returns a scalar instead of an array
+_A = Position(0, 0, 0, time_point_number=1)
+_B = Position(3, 0, 0, time_point_number=2)
+_C = Position(0, 5, 0, time_point_number=2)
+_D = Position(0, -10, 0, time_point_number=2)
+_E = Position(3, 1, 0, time_point_number=3)
+_F = Position(0, 6, 0, time_point_number=3)
+_G = Position(0, -11, 0, time_point_number=3)
+_H = Position(20, 0, 0, time_point_number=3)
+
+
+def _link_set(links: Links) -> Set[FrozenSet[Position]]:
+    return {frozenset(link) for link in links.find_all_links()}
+
+
+class TestNearestNeighborLinker(unittest.TestCase):
+
+    def setUp(self):
+        self.experiment = Experiment()
+        self.experiment.images.set_resolution(ImageResolution(1, 1, 1, 1))
+        for position in [_A, _B, _C, _D, _E, _F, _G, _H]:
+            self.experiment.positions.add(position)
+
+    def test_tolerance_1(self):
+        links = nearest_neighbor(self.experiment, tolerance=1)
+        self.assertEqual({frozenset(link) for link in [(_A, _B), (_A, _C), (_A, _D),
+                                                       (_B, _E), (_C, _F), (_D, _G), (_B, _H)]}, _link_set(links))
+
+    def test_tolerance_2(self):
+        # A now also links forward to C (5 <= 2 * 3), and H links back to all positions within 2 * 17 px
+        links = nearest_neighbor(self.experiment, tolerance=2)
+        self.assertEqual({frozenset(link) for link in [(_A, _B), (_A, _C), (_A, _D),
+                                                       (_B, _E), (_C, _F), (_D, _G), (_B, _H), (_C, _H), (_D, _H)]},
+                         _link_set(links))
@@ -0,0 +1,110 @@
+import threading
+import unittest
+from typing import Optional, Tuple, List
+
+import numpy
+from numpy import ndarray
+
+from organoid_tracker.core import TimePoint
+from organoid_tracker.core.image_loader import ImageLoader, ImageChannel
+from organoid_tracker.core.images import _PrefetchingImageLoader
+
+_CHANNEL = ImageChannel(index_zero=0)
+
+
+class _RecordingImageLoader(ImageLoader):
+    """Returns a small image that encodes the time point and z, and records all requested images. Loading on the
+    background thread can be paused, so that prefetches stay pending."""
+
+    requests: List[Tuple[int, int]]  # (time point number, z)
+    allow_loading: threading.Event
+
+    def __init__(self):
+        self.requests = list()
+        self.allow_loading = threading.Event()
+        self.allow_loading.set()
+
+    def get_3d_image_array(self, time_point: TimePoint, image_channel: ImageChannel) -> Optional[ndarray]:
+        return None
+
+    def get_2d_image_array(self, time_point: TimePoint, image_channel: ImageChannel, image_z: int) -> Optional[ndarray]:
+        if threading.current_thread() is not threading.main_thread():
+            self.allow_loading.wait()
+        self.requests.append((time_point.time_point_number(), image_z))
+        return numpy.full((2, 2), time_point.time_point_number() * 100 + image_z)
+
+    def get_image_size_zyx(self) -> Optional[Tuple[int, int, int]]:
+        return 5, 2, 2
+
+    def first_time_point_number(self) -> Optional[int]:
+        return 1
+
+    def last_time_point_number(self) -> Optional[int]:
+        return 20
+
+    def get_channel_count(self) -> int:
+        return 1
+
+    def serialize_to_config(self) -> Tuple[str, str]:
+        return "", ""
+
+    def copy(self) -> ImageLoader:
+        return self  # Shares the list of requests
+
+
+class TestPrefetchingImageLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.internal = _RecordingImageLoader()
+        self.loader = _PrefetchingImageLoader(self.internal)
+
+    def tearDown(self):
+        self.internal.allow_loading.set()
+        self.loader.close()
+
+    def _wait_for_prefetches(self):
+        for future in list(self.loader._prefetched.values()):
+            future.result()
+
+    def test_returns_prefetched_image(self):
+        self.loader.get_2d_image_array(TimePoint(5), _CHANNEL, 2)
+        self._wait_for_prefetches()
+        self.assertEqual([(5, 2), (6, 2), (7, 2), (8, 2), (9, 2)], self.internal.requests)
+
+        # Time point 6 was prefetched, so it must not be loaded again
+        image = self.loader.get_2d_image_array(TimePoint(6), _CHANNEL, 2)
+        self.assertEqual(602, image[0, 0])
+        self.assertEqual(1, self.internal.requests.count((6, 2)))
+
+    def test_prefetches_in_direction_of_travel(self):
+        self.loader.get_2d_image_array(TimePoint(10), _CHANNEL, 0)
+        self.loader.get_2d_image_array(TimePoint(9), _CHANNEL, 0)  # Moving backwards
+        self.assertEqual({(8, 0, 0), (7, 0, 0), (6, 0, 0), (5, 0, 0)}, set(self.loader._prefetched.keys()))
+
+    def test_stays_within_time_points(self):
+        self.loader.get_2d_image_array(TimePoint(19), _CHANNEL, 0)
+        self.assertEqual({(20, 0, 0)}, set(self.loader._prefetched.keys()))
+
+    def test_cancels_prefetches_for_other_z(self):
+        self.internal.allow_loading.clear()  # Keep the prefetches pending
+        self.loader.get_2d_image_array(TimePoint(3), _CHANNEL, 0)
+        old_futures = list(self.loader._prefetched.values())
+
+        self.loader.get_2d_image_array(TimePoint(3), _CHANNEL, 1)  # Other z
+        self.assertEqual({(4, 0, 1), (5, 0, 1), (6, 0, 1), (7, 0, 1)}, set(self.loader._prefetched.keys()))
+        self.assertTrue(all(future.cancelled() for future in old_futures[1:]))  # The first one may have been started
+
+        self.internal.allow_loading.set()
+        self._wait_for_prefetches()
+        for time_point_number in [5, 6, 7]:  # Were only needed for the old z
+            self.assertNotIn((time_point_number, 0), self.internal.requests)
+
+    def test_close(self):
+        self.loader.get_2d_image_array(TimePoint(1), _CHANNEL, 0)
+        self.loader.close()
+        self.assertEqual(0, len(self.loader._prefetched))
+        self.assertIsNone(self.loader._executor)
+
+        # Can still be used after closing
+        image = self.loader.get_2d_image_array(TimePoint(8), _CHANNEL, 0)
+        self.assertEqual(800, image[0, 0])
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from organoid_tracker.core import TimePoint
+from organoid_tracker.core.experiment import Experiment
+from organoid_tracker.core.image_loader import ImageChannel
+from organoid_tracker.image_loading.general_image_loader import load_images
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+
+@unittest.skipIf(zarr is None, "zarr is not installed")
+class TestZarrImageLoader(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+
+        # Two time points, starting at time point 3, two channels, and images of 4x5x6 pixels
+        self.images = numpy.random.RandomState(1).randint(0, 1000, size=(2, 2, 4, 5, 6)).astype(numpy.uint16)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write_array(self, name: str) -> str:
+        file = os.path.join(self._temp_dir.name, name)
+        zarr_array = zarr.open(file, mode="w", dtype=self.images.dtype, shape=self.images.shape,
+                               chunks=(1, 1, 1, 5, 6))
+        zarr_array[...] = self.images
+        zarr_array.attrs["first_time_point_number"] = 3
+        return file
+
+    def _test_round_trip(self, file: str):
+        experiment = Experiment()
+        load_images(experiment, file, "")
+        image_loader = experiment.images.image_loader()
+
+        self.assertEqual(3, image_loader.first_time_point_number())
+        self.assertEqual(4, image_loader.last_time_point_number())
+        numpy.testing.assert_array_equal(self.images[1, 0],
+                                         image_loader.get_3d_image_array(TimePoint(4), ImageChannel(index_zero=0)))
+        numpy.testing.assert_array_equal(self.images[0, 1, 2], image_loader.get_2d_image_array(
+            TimePoint(3), ImageChannel(index_zero=1), 2))
+
+        # Loading the saved settings must give the same images again
+        container, pattern = image_loader.serialize_to_config()
+        self.assertEqual((file, ""), (container, pattern))
+        experiment_reloaded = Experiment()
+        load_images(experiment_reloaded, container, pattern)
+        numpy.testing.assert_array_equal(self.images[0, 1], experiment_reloaded.images.image_loader()
+                                         .get_3d_image_array(TimePoint(3), ImageChannel(index_zero=1)))
+
+    def test_round_trip(self):
+        self._test_round_trip(self._write_array("images.zarr"))
+
+    def test_round_trip_without_zarr_extension(self):
+        self._test_round_trip(self._write_array("images"))